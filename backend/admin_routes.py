@@ -1,13 +1,18 @@
-from flask import Blueprint, request, jsonify
+import json
+from flask import Blueprint, request, jsonify, Response, stream_with_context
 from pymongo import MongoClient
+from app.services.auth import admin_required
+from app.services.user_cache import user_cache
+from app.services.bulk_admin import parse_bulk_request, dry_run, run_bulk
 
 admin_bp = Blueprint('admin_bp', __name__)
 
-client = MongoClient("mongodb://localhost:27017")
+client = MongoClient("mongodb://localhost:27017", connect=False)
 db = client['course_recommendation']
 users_col = db['users']
 
 @admin_bp.route('/admin/users', methods=['GET'])
+@admin_required
 def get_all_users():
     users = list(users_col.find({}, {'password': 0}))  # hide password if any
     for user in users:
@@ -15,16 +20,45 @@ def get_all_users():
     return jsonify(users)
 
 @admin_bp.route('/admin/user/<user_id>', methods=['DELETE'])
+@admin_required
 def delete_user(user_id):
     from bson import ObjectId
     result = users_col.delete_one({'_id': ObjectId(user_id)})
+    user_cache.invalidate(user_id)
     if result.deleted_count == 1:
         return jsonify({'success': True})
     return jsonify({'success': False, 'message': 'User not found'})
 
 @admin_bp.route('/admin/user/<user_id>', methods=['PATCH'])
+@admin_required
 def update_user(user_id):
     from bson import ObjectId
     data = request.json
     users_col.update_one({'_id': ObjectId(user_id)}, {'$set': data})
+    user_cache.invalidate(user_id)
     return jsonify({'success': True, 'message': 'User updated'})
+
+
+# Bulk delete/update by id list or filter:
+# {"action": "delete"|"update", "ids": [...] | "filter": {...}, "set": {...}, "chunk_size", "ordered", "dry_run"}
+# Progress is streamed as NDJSON, one line per chunk and a final summary line.
+@admin_bp.route('/admin/users/bulk', methods=['POST'])
+@admin_required
+def bulk_users():
+    try:
+        options = parse_bulk_request(request.get_json() or {})
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+    if options['dry_run']:
+        return jsonify({'success': True, **dry_run(users_col, options['query'])})
+
+    def generate():
+        try:
+            for progress in run_bulk(users_col, options):
+                yield json.dumps(progress, default=str) + '\n'
+        except Exception as e:
+            print(f"Error in bulk {options['action']}: {str(e)}")
+            yield json.dumps({'done': False, 'error': str(e)}) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
@@ -0,0 +1,9 @@
+from flask import Blueprint, jsonify
+from app.utils.catalog import catalog_store
+
+catalog_bp = Blueprint('catalog_bp', __name__)
+
+# Memory footprint and version of the loaded catalogs
+@catalog_bp.route('/api/catalogs/stats', methods=['GET'])
+def catalog_stats():
+    return jsonify({'success': True, 'data': catalog_store.current().footprint()})
@@ -0,0 +1,29 @@
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+from app.services.auth import admin_required
+from app.services.export import DATASETS, EXPORT_FORMATS, DEFAULT_BATCH_SIZE, export_rows
+
+export_bp = Blueprint('export_bp', __name__)
+
+MIMETYPES = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+
+# Stream a whole collection as CSV (questions match the upload format) or NDJSON; admins only,
+# since scores and recommendations span every user
+@export_bp.route('/api/export/<dataset>', methods=['GET'])
+@admin_required
+def export_dataset(dataset):
+    fmt = request.args.get('format', 'csv')
+    if dataset not in DATASETS:
+        return jsonify({'success': False, 'message': f'Unknown dataset: {dataset}'}), 404
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'success': False, 'message': f'Format must be one of {", ".join(EXPORT_FORMATS)}'}), 400
+    try:
+        batch_size = int(request.args.get('batch_size', DEFAULT_BATCH_SIZE))
+    except ValueError:
+        return jsonify({'success': False, 'message': 'batch_size must be an integer'}), 400
+
+    rows = export_rows(dataset, fmt, request.args.to_dict(), batch_size)
+    return Response(
+        stream_with_context(rows),
+        mimetype=MIMETYPES[fmt],
+        headers={'Content-Disposition': f'attachment; filename={dataset}.{fmt}'}
+    )
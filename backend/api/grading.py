@@ -0,0 +1,27 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from app.services.bulk_grading import read_answer_sheets, grade_cohort
+
+grading_bp = Blueprint('grading_bp', __name__)
+
+# Bulk grading for a whole cohort's answer sheets (CSV or NDJSON upload)
+@grading_bp.route('/api/submit-answers/bulk', methods=['POST'])
+@jwt_required()
+def submit_answers_bulk():
+    file = request.files.get('file')
+    if not file:
+        return jsonify({'success': False, 'message': 'No file uploaded'}), 400
+
+    fmt = request.form.get('format')
+    if not fmt:
+        fmt = 'ndjson' if (file.filename or '').endswith(('.ndjson', '.jsonl')) else 'csv'
+    domain = request.form.get('domain', 'cohort')
+
+    try:
+        sheets = read_answer_sheets(file.stream, fmt)
+        report = grade_cohort(sheets, domain)
+        return jsonify({'success': True, **report}), 201
+    except (KeyError, ValueError) as e:
+        return jsonify({'success': False, 'message': f'Invalid answer sheet: {e}'}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
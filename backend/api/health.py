@@ -0,0 +1,19 @@
+from flask import Blueprint, jsonify
+from app.services.warmup import warmup
+
+health_bp = Blueprint('health_bp', __name__)
+
+NO_STORE = {'Cache-Control': 'no-store'}
+
+
+# Liveness: the process is up and serving requests, warm or not
+@health_bp.route('/healthz', methods=['GET'])
+def healthz():
+    return jsonify({'success': True, 'status': 'ok'}), 200, NO_STORE
+
+
+# Readiness: 200 only once every required warmup step is warm, so load balancers skip cold workers
+@health_bp.route('/readyz', methods=['GET'])
+def readyz():
+    status = warmup.status()
+    return jsonify({'success': status['ready'], **status}), 200 if status['ready'] else 503, NO_STORE
@@ -0,0 +1,10 @@
+from flask import Blueprint, request, jsonify, Response
+from app.utils.metrics import metrics
+
+metrics_bp = Blueprint('metrics_bp', __name__)
+
+@metrics_bp.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    if request.args.get('format') == 'prometheus':
+        return Response(metrics.prometheus(), mimetype='text/plain')
+    return jsonify({'success': True, 'metrics': metrics.snapshot()})
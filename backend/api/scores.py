@@ -0,0 +1,21 @@
+from datetime import datetime
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.services.score_history import score_history
+
+scores_bp = Blueprint('scores_bp', __name__)
+
+# Chart data from the daily/weekly rollups: ?period=day|week&from=YYYY-MM-DD&to=YYYY-MM-DD&domain=
+@scores_bp.route('/api/scores/<user_id>/history', methods=['GET'])
+@jwt_required()
+def get_score_history(user_id):
+    if get_jwt_identity() != user_id:
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 403
+
+    try:
+        start = datetime.strptime(request.args['from'], '%Y-%m-%d') if request.args.get('from') else None
+        end = datetime.strptime(request.args['to'], '%Y-%m-%d') if request.args.get('to') else None
+        data = score_history(user_id, request.args.get('period', 'day'), start, end, request.args.get('domain'))
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    return jsonify({'success': True, 'data': data})
@@ -0,0 +1,13 @@
+from flask import Blueprint, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.services.skill_gaps import skill_gap_recommender
+
+skills_bp = Blueprint('skills_bp', __name__)
+
+# Courses, projects, internships and practice questions for the user's weakest recent skills
+@skills_bp.route('/api/recommendations/<user_id>/weak-skills', methods=['GET'])
+@jwt_required()
+def get_weak_skill_recommendations(user_id):
+    if get_jwt_identity() != user_id:
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 403
+    return jsonify({'success': True, 'data': skill_gap_recommender.recommend(user_id)})
@@ -0,0 +1,52 @@
+import json
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.models.user import User
+from app.services.admission import admission_controlled, REFRESH_LIMIT
+from app.services.user_cache import user_cache
+from app.utils.recommendations import stream_recommendation_updates
+
+stream_bp = Blueprint('stream_bp', __name__)
+
+
+def sse_frame(event: dict) -> str:
+    event = dict(event)
+    return f"event: {event.pop('event')}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+def ndjson_frame(event: dict) -> str:
+    return json.dumps(event, default=str) + '\n'
+
+
+# Refresh recommendations for new interests, streaming each search's results as it completes.
+# Server-sent events when the client accepts text/event-stream, NDJSON otherwise.
+@stream_bp.route('/api/recommendations/<user_id>/interests/stream', methods=['POST'])
+@jwt_required()
+@admission_controlled('recommendations.refresh', *REFRESH_LIMIT)
+def stream_interests(user_id):
+    if get_jwt_identity() != user_id:
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 403
+
+    interests = (request.get_json() or {}).get('interests', [])
+    if not isinstance(interests, list):
+        return jsonify({'success': False, 'message': 'Interests must be a list'}), 400
+
+    User.objects(_id=user_id).update_one(set__interests=interests)
+    user_cache.invalidate(user_id)
+
+    sse = request.accept_mimetypes.best_match(['application/x-ndjson', 'text/event-stream']) == 'text/event-stream'
+    frame = sse_frame if sse else ndjson_frame
+
+    def generate():
+        try:
+            for event in stream_recommendation_updates(user_id, interests):
+                yield frame(event)
+        except Exception as e:
+            print(f"Error streaming recommendations: {str(e)}")
+            yield frame({'event': 'error', 'message': str(e)})
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream' if sse else 'application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
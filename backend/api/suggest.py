@@ -0,0 +1,33 @@
+import time
+from flask import Blueprint, request, jsonify
+from app.services.suggest import suggester
+from app.utils.metrics import metrics
+
+suggest_bp = Blueprint('suggest_bp', __name__)
+
+MAX_SUGGESTIONS = 20
+
+# Autocomplete over catalog titles, tags and question text
+@suggest_bp.route('/api/suggest', methods=['GET'])
+def suggest():
+    started = time.perf_counter()
+    try:
+        limit = max(1, min(int(request.args.get('limit', 8)), MAX_SUGGESTIONS))
+    except ValueError:
+        limit = 8
+    suggestions = suggester.suggest(request.args.get('q', ''), limit)
+    metrics.observe('suggest_seconds', time.perf_counter() - started)
+    return jsonify({'success': True, 'suggestions': suggestions})
+
+# Record that a suggestion was picked, so it ranks higher after the next rebuild
+@suggest_bp.route('/api/suggest/hit', methods=['POST'])
+def suggest_hit():
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'success': False, 'message': 'Body must be a JSON object'}), 400
+    text = data.get('text')
+    if not text or not isinstance(text, str):
+        return jsonify({'success': False, 'message': 'Missing text'}), 400
+    if not suggester.record_hit(text):
+        return jsonify({'success': False, 'message': 'Unknown suggestion'}), 400
+    return jsonify({'success': True})
@@ -1,5 +1,8 @@
 from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models.user import User
+from app.services.user_cache import user_cache
+from app.services.update_progress import update_progress, set_progress_status, sync_progress, PROGRESS_STATUSES
 import os
 
 user_bp = Blueprint('user_bp', __name__)
@@ -9,16 +12,66 @@ def create_user():
     data = request.get_json()
     user = User(**data)
     user.save()
+    user_cache.invalidate(user.pk)
     return jsonify({"message": "User created"}), 201
+
+@user_bp.route('/api/user/<user_id>/progress', methods=['GET'])
+@jwt_required()
+def get_progress(user_id):
+    if get_jwt_identity() != user_id:
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 403
+    user = user_cache.get(user_id, ('progress',))
+    if not user:
+        return jsonify({'success': False, 'message': 'User not found'}), 404
+    return jsonify({'success': True, 'data': user.get('progress', [])})
+
+@user_bp.route('/api/user/<user_id>/progress', methods=['POST'])
+@jwt_required()
+def add_progress(user_id):
+    if get_jwt_identity() != user_id:
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 403
+    data = request.get_json() or {}
+    if not data.get('course_id'):
+        return jsonify({'success': False, 'message': 'Missing course_id'}), 400
+    result = update_progress(user_id, data['course_id'], data.get('title'))
+    return jsonify(result), 404 if 'error' in result else 200
+
+@user_bp.route('/api/user/<user_id>/progress/<course_id>', methods=['PATCH'])
+@jwt_required()
+def update_progress_status(user_id, course_id):
+    if get_jwt_identity() != user_id:
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 403
+    status = (request.get_json() or {}).get('status')
+    if status not in PROGRESS_STATUSES:
+        return jsonify({'success': False, 'message': 'Invalid status'}), 400
+    result = set_progress_status(user_id, course_id, status)
+    return jsonify(result), 404 if 'error' in result else 200
+
+# Apply many course status changes at once: {"changes": [{"course_id", "title", "status"}]}
+@user_bp.route('/api/user/<user_id>/progress/sync', methods=['POST'])
+@jwt_required()
+def sync_user_progress(user_id):
+    if get_jwt_identity() != user_id:
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 403
+    changes = (request.get_json() or {}).get('changes', [])
+    if not isinstance(changes, list):
+        return jsonify({'success': False, 'message': 'changes must be a list'}), 400
+    try:
+        result = sync_progress(user_id, changes)
+    except (KeyError, ValueError) as e:
+        return jsonify({'success': False, 'message': f'Invalid change: {e}'}), 400
+    return jsonify(result), 404 if 'error' in result else 200
     
 import requests
 from flask import Blueprint, request, jsonify
+from app.services.clerk import clerk_metadata_request
+from app.services.breaker import clerk_breaker, CircuitOpen
+from app.services.admission import admission_controlled, WRITE_LIMIT
 
 update_bp = Blueprint('update_bp', __name__)
 
-CLERK_SECRET_KEY = os.getenv('CLERK_SECRET_KEY') # Store this securely
-
 @update_bp.route('/api/update-interests', methods=['POST'])
+@admission_controlled('clerk.update', *WRITE_LIMIT)
 def update_interests():
     data = request.json
     user_id = data.get('userId')
@@ -29,22 +82,15 @@ def update_interests():
         return jsonify({'success': False, 'message': 'Missing userId'}), 400
 
     try:
-        response = requests.patch(
-            f'https://api.clerk.com/v1/users/{user_id}',
-            headers={
-                'Authorization': f'Bearer {CLERK_SECRET_KEY}',
-                'Content-Type': 'application/json'
-            },
-            json={
-                'public_metadata': {
-                    'interests': interests,
-                    'skills': skills
-                }
-            }
-        )
+        url, headers, body = clerk_metadata_request(user_id, interests, skills)
+        response = clerk_breaker.call(requests.patch, url, headers=headers, json=body)
         if response.status_code == 200:
+            user_cache.invalidate(user_id)
             return jsonify({'success': True, 'message': 'Metadata updated'})
         else:
             return jsonify({'success': False, 'message': response.text}), 500
+    except CircuitOpen as e:
+        return (jsonify({'success': False, 'message': 'Clerk is unavailable, try again later'}), 503,
+                {'Retry-After': str(max(1, int(e.retry_after + 0.999)))})
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
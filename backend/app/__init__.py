@@ -1,9 +1,11 @@
 from flask import Flask
+from app.services.profiling import install_profiling
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
 from mongoengine import connect
 from app.config import Config
 from app.routes import auth_bp, recommendations_bp, search_bp
+from api.metrics import metrics_bp
 
 def create_app():
     app = Flask(__name__)
@@ -11,6 +13,7 @@ def create_app():
 
     # Initialize JWT and CORS
     JWTManager(app)
+    install_profiling(app)
     CORS(app, origins=Config.CORS_ORIGINS, methods=Config.CORS_METHODS, allow_headers=Config.CORS_HEADERS)
 
     # Connect to MongoDB using mongoengine
@@ -20,5 +23,6 @@ def create_app():
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(recommendations_bp, url_prefix='/api/recommendations')
     app.register_blueprint(search_bp, url_prefix='/api/search')
+    app.register_blueprint(metrics_bp)
 
     return app
@@ -10,4 +10,5 @@ class Question(Document):
     option_c = StringField(required=True)
     option_d = StringField(required=True)
     correct_answer = StringField(required=True)
-    badge = StringField()
\ No newline at end of file
+    badge = StringField()
+    meta = {'indexes': [('domain', 'id')]}  # keyset paging within a domain
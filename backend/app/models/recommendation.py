@@ -1,5 +1,5 @@
 # app/models/recommendation.py
-from mongoengine import Document, StringField, ReferenceField, ListField, DateTimeField
+from mongoengine import Document, StringField, ReferenceField, ListField, DateTimeField, FloatField
 from datetime import datetime
 
 
@@ -10,4 +10,9 @@ class Recommendation(Document):
     description = StringField()
     tags = ListField(StringField())
     category = StringField()
-    created_at = DateTimeField(default=datetime.utcnow)
\ No newline at end of file
+    source = StringField()  # 'catalog' for offline batch matches, unset for SerpAPI results
+    score = FloatField()
+    url_key = StringField()  # normalized url, unique per (user, category); see app.services.recommendation_store
+    created_at = DateTimeField(default=datetime.utcnow)
+    updated_at = DateTimeField()
+    expires_at = DateTimeField()  # TTL-indexed; unset for catalog matches
\ No newline at end of file
@@ -6,4 +6,4 @@ class Score(Document):
     domain = StringField(required=True)
     skill_scores = DictField()  # e.g., {"NLP": 80, "Vision": 60}
     submitted_at = DateTimeField(default=datetime.utcnow)
-    meta = {'collection': 'scores'}
+    meta = {'collection': 'scores', 'indexes': [('user_id', '-submitted_at')]}  # latest scores per user
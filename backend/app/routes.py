@@ -6,6 +6,10 @@ from app.utils.recommendations import get_user_recommendations, update_recommend
 from app.models.question import Question
 from app.utils.search import search_questions, get_all_domains, get_questions_by_domain
 from app.services.auth import hybrid_auth_required  
+from app.services.admission import admission_controlled, REFRESH_LIMIT, READ_LIMIT
+from app.services.user_cache import user_cache
+from app.services.ranking import search_options
+from app.utils.pagination import ranked_page_options, ranked_page_fields, encode_cursor, decode_cursor
 
 
 # Create blueprints
@@ -46,6 +50,7 @@ def signin():
 # Recommendations routes
 @recommendations_bp.route('/<int:user_id>', methods=['GET'])
 @hybrid_auth_required
+@admission_controlled('recommendations.read', *READ_LIMIT)
 def get_recommendations(user_id):
     current_user_id = int(request.user['sub'])
     if current_user_id != user_id:
@@ -55,6 +60,7 @@ def get_recommendations(user_id):
     return jsonify({'success': True, 'data': recommendations}), 200
 
 @recommendations_bp.route('/<int:user_id>/interests', methods=['POST'])
+@admission_controlled('recommendations.refresh', *REFRESH_LIMIT)
 def update_interests(user_id):
     current_user_id = get_jwt_identity()
     if current_user_id != user_id:
@@ -70,44 +76,39 @@ def update_interests(user_id):
     result = update_user_interests(user_id, interests)
     if not result['success']:
         return jsonify(result), 400
+    user_cache.invalidate(user_id)
     
     # Update recommendations
     recommendations = update_recommendations(user_id, interests)
     return jsonify({'success': True, 'data': recommendations}), 200
-def search_questions(query):
-    results = Question.objects(question__icontains=query)
-    return [
-        {
-            "id": str(q.id),
-            "question": q.question,
-            "domain": q.domain,
-            "difficulty": q.difficulty_level,
-            "options": {
-                "a": q.option_a,
-                "b": q.option_b,
-                "c": q.option_c,
-                "d": q.option_d
-            },
-            "badge": q.badge
-        } for q in results
-    ]
 
-def get_all_domains():
-    return Question.objects().distinct('domain')
+# Question search routes
+@search_bp.route('/questions', methods=['GET'])
+def search_question_text():
+    try:
+        query, limit, _, offset = ranked_page_options(request.args)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    if not query:
+        return jsonify({'success': False, 'message': 'Query is missing'}), 400
+    data, total = search_questions(query, limit, offset)
+    return jsonify({'success': True, 'data': data, **ranked_page_fields(query, offset, limit, total)}), 200
 
-def get_questions_by_domain(domain):
-    results = Question.objects(domain=domain)
-    return [
-        {
-            "id": str(q.id),
-            "question": q.question,
-            "difficulty": q.difficulty_level,
-            "options": {
-                "a": q.option_a,
-                "b": q.option_b,
-                "c": q.option_c,
-                "d": q.option_d
-            },
-            "badge": q.badge
-        } for q in results
-    ]
\ No newline at end of file
+@search_bp.route('/domains', methods=['GET'])
+def list_domains():
+    return jsonify({'success': True, 'data': get_all_domains()}), 200
+
+@search_bp.route('/domains/<string:domain>/questions', methods=['GET'])
+def list_domain_questions(domain):
+    _, limit, _ = search_options(request.args)
+    try:
+        after = decode_cursor(request.args.get('cursor'), domain).get('after')
+        data, next_after, total = get_questions_by_domain(domain, limit, after)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    return jsonify({
+        'success': True,
+        'data': data,
+        'next_cursor': encode_cursor(domain, after=next_after) if next_after else None,
+        'total_estimate': total
+    }), 200
@@ -0,0 +1,166 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from functools import wraps
+
+from flask import request, jsonify, make_response
+from pymongo import ReturnDocument
+
+from app.utils.metrics import metrics
+
+LEDGER_COLLECTION = 'quota_ledger'
+MAX_BUCKETS = 100000
+
+# (tokens per second, burst capacity) per route family
+REFRESH_LIMIT = (float(os.getenv('REFRESH_RATE_PER_MIN', 1)) / 60, float(os.getenv('REFRESH_BURST', 3)))
+READ_LIMIT = (float(os.getenv('READ_RATE_PER_SEC', 1)), float(os.getenv('READ_BURST', 10)))
+WRITE_LIMIT = (float(os.getenv('WRITE_RATE_PER_MIN', 6)) / 60, float(os.getenv('WRITE_BURST', 3)))
+
+
+class TokenBucket:
+    __slots__ = ('tokens', 'updated')
+
+    def __init__(self, capacity: float):
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+
+class AdmissionController:
+    """Per-(user, route) token buckets: `rate` requests/second sustained, bursts up to `capacity`.
+
+    Buckets live in-process and the least recently used ones are dropped past MAX_BUCKETS.
+    """
+
+    def __init__(self, max_buckets: int = MAX_BUCKETS):
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()
+        self.max_buckets = max_buckets
+
+    def admit(self, user: str, route: str, rate: float, capacity: float):
+        """Take one token; returns (admitted, tokens left, seconds until the next token)."""
+        now = time.monotonic()
+        key = (user, route)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(capacity)
+                if len(self._buckets) > self.max_buckets:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket.tokens = min(capacity, bucket.tokens + (now - bucket.updated) * rate)
+            bucket.updated = now
+
+            if bucket.tokens >= 1:
+                bucket.tokens -= 1
+                return True, bucket.tokens, 0.0
+            return False, bucket.tokens, (1 - bucket.tokens) / rate
+
+
+class QuotaLedger:
+    """Monthly call budget for a paid upstream, shared by every worker through one Mongo document.
+
+    Spending is a single conditional `$inc`, so concurrent workers can never overshoot the quota.
+    """
+
+    def __init__(self, name: str, quota: int, low_water: float = 0.1):
+        self.name = name
+        self.quota = quota
+        self.low_water = int(quota * low_water)
+        self.remaining = quota  # last value seen by this process
+        self._opened = set()
+
+    def _period_key(self):
+        return f"{self.name}:{datetime.utcnow():%Y-%m}"
+
+    def _spend_ops(self, calls: int):
+        key = self._period_key()
+        return key, {'_id': key, 'used': {'$lte': self.quota - calls}}, {'$inc': {'used': calls}}
+
+    def _record(self, calls: int, document, granted: bool):
+        if document is not None:
+            self.remaining = max(0, self.quota - document.get('used', 0))
+        elif not granted:
+            # The conditional $inc matched nothing, so fewer than `calls` are left
+            self.remaining = min(self.remaining, calls - 1)
+        metrics.set('quota_remaining', self.remaining, upstream=self.name)
+        metrics.inc('quota_calls_total' if granted else 'quota_denied_total', calls, upstream=self.name)
+        return granted
+
+    def spend(self, calls: int = 1) -> bool:
+        """Record `calls` upstream calls if the budget allows them; False means shed the work."""
+        from mongoengine.connection import get_db
+        collection = get_db()[LEDGER_COLLECTION]
+        key, condition, update = self._spend_ops(calls)
+        if key not in self._opened:
+            collection.update_one({'_id': key}, {'$setOnInsert': {'used': 0, 'quota': self.quota}}, upsert=True)
+            self._opened.add(key)
+        document = collection.find_one_and_update(condition, update, return_document=ReturnDocument.AFTER)
+        return self._record(calls, document, document is not None)
+
+    async def spend_async(self, db, calls: int = 1) -> bool:
+        collection = db[LEDGER_COLLECTION]
+        key, condition, update = self._spend_ops(calls)
+        if key not in self._opened:
+            await collection.update_one({'_id': key}, {'$setOnInsert': {'used': 0, 'quota': self.quota}}, upsert=True)
+            self._opened.add(key)
+        document = await collection.find_one_and_update(condition, update, return_document=ReturnDocument.AFTER)
+        return self._record(calls, document, document is not None)
+
+    def affordable(self, wanted: int) -> int:
+        """How many of `wanted` calls to attempt: everything above the low-water mark, one at a time below it."""
+        if self.remaining <= 0:
+            return 0
+        if self.remaining <= self.low_water:
+            return min(wanted, 1)
+        return min(wanted, self.remaining - self.low_water)
+
+
+admission = AdmissionController()
+serpapi_ledger = QuotaLedger('serpapi', int(os.getenv('SERPAPI_MONTHLY_QUOTA', 5000)))
+
+
+def admission_key():
+    """Who a request is charged to: the JWT identity, else the body's userId, else the client address."""
+    try:
+        from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+        verify_jwt_in_request(optional=True)
+        identity = get_jwt_identity()
+        if identity:
+            return str(identity)
+    except Exception:
+        pass
+    data = request.get_json(silent=True) or {}
+    return str(data.get('userId') or request.remote_addr)
+
+
+def check_admission(user: str, route: str, rate: float, capacity: float):
+    """Charge one request to the user's bucket; returns (admitted, budget headers for the response)."""
+    admitted, left, retry_after = admission.admit(user, route, rate, capacity)
+    metrics.inc('admission_total', route=route, outcome='admitted' if admitted else 'rejected')
+    headers = {
+        'X-RateLimit-Limit': str(int(capacity)),
+        'X-RateLimit-Remaining': str(int(left)),
+        'X-SerpAPI-Budget-Remaining': str(serpapi_ledger.remaining),
+    }
+    if not admitted:
+        headers['Retry-After'] = str(max(1, int(retry_after + 0.999)))
+    return admitted, headers
+
+
+def admission_controlled(route: str, rate: float, capacity: float):
+    """Reject requests over the per-user token bucket with 429 and report budgets in headers."""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            admitted, headers = check_admission(admission_key(), route, rate, capacity)
+            if not admitted:
+                response = make_response(jsonify({'success': False, 'message': 'Too many requests'}), 429)
+            else:
+                response = make_response(fn(*args, **kwargs))
+            response.headers.update(headers)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,137 @@
+import asyncio
+import os
+from datetime import datetime
+from typing import Dict, List
+
+import httpx
+from pymongo import AsyncMongoClient
+from pymongo.errors import BulkWriteError
+
+from app.services.clerk import clerk_metadata_request
+from app.services.events import INNGEST_EVENT_URL, inngest_payload
+from app.services.admission import serpapi_ledger
+from app.services.breaker import serpapi_breaker, clerk_breaker, CircuitOpen
+from app.services.recommendation_store import recommendation_upsert, only_duplicate_keys
+from app.services.user_cache import user_cache
+from app.utils.recommendations import (
+    SERP_API_URL, serpapi_params, interests_query, summarize_results, recommendation_fields,
+    planned_searches, catalog_results, fallback_recommendations
+)
+from app.utils.metrics import metrics
+
+HTTP_TIMEOUT = float(os.getenv('ASYNC_HTTP_TIMEOUT', 30))
+HTTP_MAX_CONNECTIONS = int(os.getenv('ASYNC_HTTP_MAX_CONNECTIONS', 1000))
+
+
+class AsyncClients:
+    """Event-loop-bound HTTP and Mongo clients shared by every async request in a worker."""
+
+    def __init__(self):
+        self.http = None
+        self.mongo = None
+        self.db = None
+
+    async def open(self):
+        self.http = httpx.AsyncClient(
+            timeout=HTTP_TIMEOUT,
+            limits=httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS,
+                                max_keepalive_connections=HTTP_MAX_CONNECTIONS)
+        )
+        self.mongo = AsyncMongoClient(os.getenv('MONGODB_URI'))
+        self.db = self.mongo['dashboard']
+
+    async def close(self):
+        if self.http is not None:
+            await self.http.aclose()
+        if self.mongo is not None:
+            await self.mongo.close()
+
+
+async def fetch_serpapi_results_async(clients: AsyncClients, query: str, category: str = None) -> dict:
+    """Fetch results from SERP API without blocking the event loop; local catalogs when it is unavailable."""
+    if serpapi_breaker.rejecting:
+        return catalog_results(query, category, 'open')
+    if not await serpapi_ledger.spend_async(clients.db):
+        return catalog_results(query, category, 'quota')
+
+    try:
+        response = await serpapi_breaker.call_async(clients.http.get, SERP_API_URL, params=serpapi_params(query))
+        response.raise_for_status()
+        metrics.inc('recommendations_source_total', source='serpapi')
+        return response.json()
+    except CircuitOpen:
+        return catalog_results(query, category, 'open')
+    except Exception as e:
+        print(f"Error fetching from SERP API: {str(e)}")
+        return catalog_results(query, category)
+
+
+async def get_user_recommendations_async(clients: AsyncClients, user_id: str) -> List[Dict]:
+    user = user_cache.get_cached(user_id, ('interests',))
+    if user is None:
+        user = await clients.db['users'].find_one({'_id': user_id}, {'interests': 1})
+        user_cache.store(user_id, user, ('interests',))
+    if not user:
+        return []
+
+    query = interests_query(user.get('interests'))
+    if serpapi_breaker.rejecting:
+        return fallback_recommendations(query, 'open')
+    if not await serpapi_ledger.spend_async(clients.db):
+        return fallback_recommendations(query, 'quota')
+
+    try:
+        response = await serpapi_breaker.call_async(
+            clients.http.get, SERP_API_URL, params=serpapi_params(query, num=None)
+        )
+        if response.status_code != 200:
+            return fallback_recommendations(query)
+        metrics.inc('recommendations_source_total', source='serpapi')
+        return summarize_results(response.json().get("organic_results", []))
+    except CircuitOpen:
+        return fallback_recommendations(query, 'open')
+    except Exception as e:
+        print(f"Error in get_user_recommendations: {str(e)}")
+        return fallback_recommendations(query)
+
+
+async def update_recommendations_async(clients: AsyncClients, user_id: str, interests: List[str]) -> Dict:
+    """Run every interest x category search concurrently, then replace the stored results."""
+    searches, shed = planned_searches(interests)
+    if serpapi_breaker.rejecting:
+        searches, shed = [], len(searches) + shed
+    results = await asyncio.gather(
+        *(fetch_serpapi_results_async(clients, query, category) for category, query in searches)
+    )
+    degraded = serpapi_breaker.rejecting or any(found.get('degraded') for found in results)
+
+    created_at = datetime.utcnow()
+    writes = [
+        recommendation_upsert(recommendation_fields(user_id, result, category), created_at)
+        for (category, _), found in zip(searches, results)
+        for result in found.get('organic_results', []) if result.get('link')
+    ]
+    collection = clients.db['recommendation']
+    if searches:
+        await collection.delete_many({'user': user_id, 'source': {'$ne': 'catalog'}})
+    if writes:
+        try:
+            await collection.bulk_write(writes, ordered=False)
+        except BulkWriteError as e:
+            if not only_duplicate_keys(e):
+                print(f"Error saving recommendations: {str(e)}")
+
+    return {
+        "recommendations": await get_user_recommendations_async(clients, user_id),
+        "shed_searches": max(0, shed),
+        "degraded": degraded
+    }
+
+
+async def send_inngest_event_async(clients: AsyncClients, content: dict) -> httpx.Response:
+    return await clients.http.post(INNGEST_EVENT_URL, json=inngest_payload(content))
+
+
+async def update_clerk_metadata_async(clients: AsyncClients, user_id: str, interests, skills) -> httpx.Response:
+    url, headers, body = clerk_metadata_request(user_id, interests, skills)
+    return await clerk_breaker.call_async(clients.http.patch, url, headers=headers, json=body)
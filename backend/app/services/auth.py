@@ -1,12 +1,14 @@
 import jwt
 import os
 from flask import request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
 from functools import wraps
-from app.models.user import User  # Update this to match your MongoDB User model
+from app.services.user_cache import user_cache
 from datetime import datetime, timedelta 
 
 JWT_SECRET = os.getenv("JWT_SECRET", "your_default_secret")
 JWT_ALGORITHM = "HS256"
+ADMIN_USER_IDS = {user_id for user_id in os.getenv('ADMIN_USER_IDS', '').split(',') if user_id}
 
 # --- Verify JWT
 def verify_jwt(token):
@@ -35,7 +37,7 @@ def auth_required(f):
             # Optional: ensure user exists in DB
             email = decoded_token.get("email")
             if email:
-                user = User.objects(email=email).first()
+                user = user_cache.get_by_email(email, ('_id',))
                 if not user:
                     return jsonify({'success': False, 'message': 'User not found'}), 404
 
@@ -66,4 +68,14 @@ def hybrid_auth_required(fn):
             return fn(*args, **kwargs)
         except Exception:
             return jsonify({'success': False, 'message': 'Unauthorized'}), 403
-    return wrapper
\ No newline at end of file
+    return wrapper
+
+# --- Admin-only routes: a flask_jwt_extended identity listed in ADMIN_USER_IDS
+def admin_required(f):
+    @wraps(f)
+    @jwt_required()
+    def decorated(*args, **kwargs):
+        if get_jwt_identity() not in ADMIN_USER_IDS:
+            return jsonify({'success': False, 'message': 'Admin access required'}), 403
+        return f(*args, **kwargs)
+    return decorated
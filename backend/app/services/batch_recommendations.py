@@ -0,0 +1,200 @@
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List
+
+import numpy as np
+from pymongo import DeleteMany
+from scipy import sparse
+
+from app.services.recommendation_store import recommendation_collection, recommendation_upsert
+from app.models.user import User
+from app.services.ranking import tokenize
+from app.utils.catalog import catalog_store
+
+# Catalog -> Recommendation.category, matching the categories written by update_recommendations
+CATEGORIES = (('courses', 'course'), ('experiences', 'project'), ('internships', 'internship'))
+
+SOURCE = 'catalog'
+TAG_WEIGHT = 1.0
+TITLE_WEIGHT = 0.5
+INTEREST_WEIGHT = 1.0
+SKILL_WEIGHT = 0.5
+
+
+def as_terms(value) -> List[str]:
+    """User interests/skills are lists, but older documents store them as a single string."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(',')
+    return [term for item in value for term in tokenize(str(item))]
+
+
+class CatalogMatrix:
+    """Row-normalised catalog x tag matrix over every curated catalog item."""
+
+    def __init__(self, snapshot=None):
+        snapshot = snapshot or catalog_store.current()
+        catalogs = [(category, snapshot.items[kind]) for kind, category in CATEGORIES]
+        self.items, self.categories = [], []
+        self.vocabulary: Dict[str, int] = {}
+        rows, cols, values = [], [], []
+
+        for category, entries in catalogs:
+            for entry in entries:
+                weights = {}
+                for term in tokenize(' '.join(entry.tags)):
+                    weights[term] = TAG_WEIGHT
+                for term in tokenize(entry.title):
+                    weights.setdefault(term, TITLE_WEIGHT)
+                item = len(self.items)
+                for term, weight in weights.items():
+                    rows.append(item)
+                    cols.append(self.vocabulary.setdefault(term, len(self.vocabulary)))
+                    values.append(weight)
+                self.items.append(entry)
+                self.categories.append(category)
+
+        matrix = sparse.csr_matrix(
+            (values, (rows, cols)), shape=(len(self.items), len(self.vocabulary)), dtype=np.float32
+        )
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1))).ravel()
+        norms[norms == 0] = 1.0
+        self.matrix = sparse.diags(1.0 / norms).dot(matrix).tocsr()
+        self.category_names = [category for category, _ in catalogs]
+        self.category_codes = np.array(
+            [self.category_names.index(category) for category in self.categories], dtype=np.int8
+        )
+
+    def user_matrix(self, users: List[Dict]) -> sparse.csr_matrix:
+        """Build the sparse user x tag matrix for a chunk of raw user documents."""
+        rows, cols, values = [], [], []
+        for row, user in enumerate(users):
+            weights = {}
+            for term in as_terms(user.get('skills')):
+                weights[term] = SKILL_WEIGHT
+            for term in as_terms(user.get('interests')):
+                weights[term] = INTEREST_WEIGHT
+            for term, weight in weights.items():
+                col = self.vocabulary.get(term)
+                if col is not None:
+                    rows.append(row)
+                    cols.append(col)
+                    values.append(weight)
+        return sparse.csr_matrix(
+            (values, (rows, cols)), shape=(len(users), len(self.vocabulary)), dtype=np.float32
+        )
+
+    def top_matches(self, users: List[Dict], top_k: int) -> List[List[tuple]]:
+        """Score a chunk of users against the whole catalog with one sparse product."""
+        scores = self.user_matrix(users).dot(self.matrix.T).tocsr()
+        matches = []
+        for row in range(scores.shape[0]):
+            start, end = scores.indptr[row], scores.indptr[row + 1]
+            items, values = scores.indices[start:end], scores.data[start:end]
+            picked = []
+            for code in range(len(self.category_names)):
+                mask = self.category_codes[items] == code
+                cat_items, cat_values = items[mask], values[mask]
+                if len(cat_items) > top_k:
+                    keep = np.argpartition(-cat_values, top_k - 1)[:top_k]
+                    cat_items, cat_values = cat_items[keep], cat_values[keep]
+                order = np.lexsort((cat_items, -cat_values))
+                picked.extend((int(cat_items[i]), float(cat_values[i])) for i in order)
+            matches.append(picked)
+        return matches
+
+
+def recommendation_writes(catalog: CatalogMatrix, users: List[Dict], matches) -> List:
+    """Replace each user's catalog recommendations: one delete for the chunk, then the upserts."""
+    created_at = datetime.utcnow()
+    writes = [DeleteMany({'user': {'$in': [str(user['_id']) for user in users]}, 'source': SOURCE})]
+    for user, picked in zip(users, matches):
+        for item, score in picked:
+            entry = catalog.items[item]
+            writes.append(recommendation_upsert({
+                'user': str(user['_id']),
+                'title': entry.title,
+                'url': entry.url,
+                'description': entry.description,
+                'tags': list(entry.tags),
+                'category': catalog.categories[item],
+                'source': SOURCE,
+                'score': round(score, 4),
+                'created_at': created_at
+            }, created_at))
+    return writes
+
+
+def iter_user_chunks(chunk_size: int) -> Iterable[List[Dict]]:
+    cursor = User._get_collection().find({}, {'interests': 1, 'skills': 1}).batch_size(chunk_size)
+    chunk = []
+    for user in cursor:
+        chunk.append(user)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+_catalog_matrix = None
+
+
+def current_catalog_matrix() -> CatalogMatrix:
+    """CatalogMatrix of the current catalog snapshot, rebuilt only when the catalogs reload."""
+    global _catalog_matrix
+    snapshot = catalog_store.current()
+    if _catalog_matrix is None or _catalog_matrix[0] is not snapshot:
+        _catalog_matrix = (snapshot, CatalogMatrix(snapshot))
+    return _catalog_matrix[1]
+
+
+def recompute_user(user_id: str, top_k: int = 5) -> int:
+    """Refresh one user's catalog recommendations; returns how many were written."""
+    user = User._get_collection().find_one({'_id': user_id}, {'interests': 1, 'skills': 1})
+    if not user:
+        return 0
+    catalog = current_catalog_matrix()
+    writes = recommendation_writes(catalog, [user], catalog.top_matches([user], top_k))
+    recommendation_collection().bulk_write(writes, ordered=True)
+    return len(writes) - 1
+
+
+def run(top_k: int = 5, chunk_size: int = 5000, dry_run: bool = False) -> Dict:
+    """Compute catalog recommendations for every user, chunk by chunk."""
+    started = time.perf_counter()
+    catalog = CatalogMatrix()
+    collection = recommendation_collection()
+    users_seen = written = 0
+
+    for users in iter_user_chunks(chunk_size):
+        matches = catalog.top_matches(users, top_k)
+        writes = recommendation_writes(catalog, users, matches)
+        if not dry_run:
+            collection.bulk_write(writes, ordered=True)
+        users_seen += len(users)
+        written += len(writes) - 1
+
+    return {
+        'users': users_seen,
+        'recommendations': written,
+        'catalog_items': len(catalog.items),
+        'tags': len(catalog.vocabulary),
+        'seconds': round(time.perf_counter() - started, 2)
+    }
+
+
+if __name__ == '__main__':
+    import argparse
+    import json
+    from app.utils.db import connect_db
+
+    parser = argparse.ArgumentParser(description="Match every user's interests and skills against the curated catalogs.")
+    parser.add_argument('--top-k', type=int, default=5, help="Recommendations per category per user")
+    parser.add_argument('--chunk-size', type=int, default=5000, help="Users scored per sparse product")
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args()
+
+    connect_db()
+    print(json.dumps(run(args.top_k, args.chunk_size, args.dry_run)))
@@ -0,0 +1,128 @@
+import os
+import threading
+import time
+
+from app.utils.metrics import metrics
+
+# circuit_state gauge values
+STATE_VALUES = {'closed': 0, 'half_open': 1, 'open': 2}
+
+
+class CircuitOpen(Exception):
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} circuit is open")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Fail fast on an upstream that keeps failing instead of tying up a worker per request.
+
+    closed: calls go through with `timeout`; `failure_threshold` consecutive failures open the circuit.
+    open: calls raise CircuitOpen without touching the network for `reset_seconds`.
+    half_open: one probe call is let through; success closes the circuit, failure opens it again.
+
+    Exceptions (timeouts, connection errors) and 5xx/429 responses count as failures; other 4xx are
+    the caller's problem and count as successes.
+    """
+
+    def __init__(self, name: str, timeout: float, failure_threshold: int = 5, reset_seconds: float = 30):
+        self.name = name
+        self.timeout = timeout
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_started = None
+        self._lock = threading.Lock()
+        metrics.set('circuit_state', STATE_VALUES[self.state], upstream=name)
+
+    def _transition(self, state: str):
+        if state != self.state:
+            self.state = state
+            metrics.set('circuit_state', STATE_VALUES[state], upstream=self.name)
+            metrics.inc('circuit_transitions_total', upstream=self.name, to=state)
+            print(f"[!] {self.name} circuit {state}")
+
+    def retry_after(self) -> float:
+        return max(0.0, self.opened_at + self.reset_seconds - time.monotonic())
+
+    @property
+    def rejecting(self) -> bool:
+        """True while calls would be refused; lets callers skip work (e.g. spending quota) up front."""
+        return self.state == 'open' and self.retry_after() > 0
+
+    def allow(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            if self.state == 'open' and now - self.opened_at >= self.reset_seconds:
+                self._transition('half_open')
+            if self.state == 'closed':
+                return True
+            # A probe that never reported back (e.g. its thread died) is replaced after one timeout
+            if self.state == 'half_open' and (self.probe_started is None or now - self.probe_started > self.timeout):
+                self.probe_started = now
+                return True
+        metrics.inc('circuit_calls_total', upstream=self.name, outcome='rejected')
+        return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.probe_started = None
+            self._transition('closed')
+        metrics.inc('circuit_calls_total', upstream=self.name, outcome='success')
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self.probe_started = None
+            if self.state == 'half_open' or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+                self._transition('open')
+        metrics.inc('circuit_calls_total', upstream=self.name, outcome='failure')
+
+    def _record(self, response):
+        status = getattr(response, 'status_code', 200)
+        if status >= 500 or status == 429:
+            self.record_failure()
+        else:
+            self.record_success()
+
+    def call(self, fn, *args, **kwargs):
+        """`fn(*args, timeout=self.timeout, **kwargs)` through the breaker; raises CircuitOpen when open."""
+        if not self.allow():
+            raise CircuitOpen(self.name, self.retry_after())
+        try:
+            response = fn(*args, timeout=self.timeout, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        self._record(response)
+        return response
+
+    async def call_async(self, fn, *args, **kwargs):
+        if not self.allow():
+            raise CircuitOpen(self.name, self.retry_after())
+        try:
+            response = await fn(*args, timeout=self.timeout, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        self._record(response)
+        return response
+
+
+serpapi_breaker = CircuitBreaker(
+    'serpapi',
+    timeout=float(os.getenv('SERPAPI_TIMEOUT', 5)),
+    failure_threshold=int(os.getenv('SERPAPI_FAILURE_THRESHOLD', 5)),
+    reset_seconds=float(os.getenv('SERPAPI_RESET_SECONDS', 30))
+)
+clerk_breaker = CircuitBreaker(
+    'clerk',
+    timeout=float(os.getenv('CLERK_TIMEOUT', 5)),
+    failure_threshold=int(os.getenv('CLERK_FAILURE_THRESHOLD', 5)),
+    reset_seconds=float(os.getenv('CLERK_RESET_SECONDS', 30))
+)
@@ -0,0 +1,132 @@
+import os
+from typing import Dict, Iterator, List
+
+from bson import ObjectId
+from pymongo import DeleteOne, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from app.services.user_cache import user_cache
+
+BULK_CHUNK_SIZE = int(os.getenv('ADMIN_BULK_CHUNK_SIZE', 500))
+MAX_CHUNK_SIZE = 5000
+BULK_ACTIONS = ('delete', 'update')
+
+# Operators that run server-side JavaScript or aggregation expressions are never accepted in a filter
+FORBIDDEN_OPERATORS = {'$where', '$function', '$accumulator', '$expr'}
+
+
+def user_key(user_id):
+    """Admin ids are ObjectIds in `course_recommendation`; Clerk ids stay strings."""
+    return ObjectId(user_id) if ObjectId.is_valid(user_id) else user_id
+
+
+def check_filter(value, path='filter'):
+    if isinstance(value, dict):
+        for key, nested in value.items():
+            if key in FORBIDDEN_OPERATORS:
+                raise ValueError(f"{path}: operator {key} is not allowed")
+            check_filter(nested, f"{path}.{key}")
+    elif isinstance(value, list):
+        for nested in value:
+            check_filter(nested, path)
+
+
+def parse_bulk_request(data: Dict) -> Dict:
+    """Validate a bulk request body and return the normalised options."""
+    action = data.get('action')
+    if action not in BULK_ACTIONS:
+        raise ValueError(f"action must be one of {', '.join(BULK_ACTIONS)}")
+
+    ids, query = data.get('ids'), data.get('filter')
+    if (ids is None) == (query is None):
+        raise ValueError("Provide exactly one of ids or filter")
+    if ids is not None:
+        if not isinstance(ids, list) or not ids:
+            raise ValueError("ids must be a non-empty list")
+        query = {'_id': {'$in': [user_key(str(user_id)) for user_id in ids]}}
+    elif not isinstance(query, dict) or not query:
+        raise ValueError("filter must be a non-empty object")
+    check_filter(query)
+
+    changes = data.get('set') or {}
+    if action == 'update':
+        if not isinstance(changes, dict) or not changes:
+            raise ValueError("update needs a non-empty set object")
+        if any(key.startswith('$') or key == '_id' for key in changes):
+            raise ValueError("set may not contain operators or _id")
+
+    try:
+        chunk_size = int(data.get('chunk_size', BULK_CHUNK_SIZE))
+    except (TypeError, ValueError):
+        raise ValueError("chunk_size must be an integer")
+
+    return {
+        'action': action,
+        'query': query,
+        'changes': changes,
+        'chunk_size': max(1, min(chunk_size, MAX_CHUNK_SIZE)),
+        'ordered': bool(data.get('ordered', True)),
+        'dry_run': bool(data.get('dry_run', False))
+    }
+
+
+def dry_run(collection, query: Dict) -> Dict:
+    """Count matches without fetching documents.
+
+    The count only reads index keys when an index covers the filter (always true for an id list);
+    `covered` reports whether the planner managed that, i.e. examined no documents.
+    """
+    matched = collection.count_documents(query)
+    stats = collection.find(query, {'_id': 1}).explain().get('executionStats', {})
+    return {'dry_run': True, 'matched': matched, 'covered': stats.get('totalDocsExamined') == 0}
+
+
+def chunk_operations(action: str, ids: List, changes: Dict) -> List:
+    if action == 'delete':
+        return [DeleteOne({'_id': user_id}) for user_id in ids]
+    return [UpdateOne({'_id': user_id}, {'$set': changes}) for user_id in ids]
+
+
+def iter_id_chunks(collection, query: Dict, chunk_size: int) -> Iterator[List]:
+    """Matching ids in chunks, read up front so deletes cannot shift the cursor under us."""
+    ids = [doc['_id'] for doc in collection.find(query, {'_id': 1}).batch_size(chunk_size)]
+    for start in range(0, len(ids), chunk_size):
+        yield ids[start:start + chunk_size]
+
+
+def run_bulk(collection, options: Dict) -> Iterator[Dict]:
+    """Apply the operation chunk by chunk, yielding one progress record per chunk and a summary."""
+    action, ordered = options['action'], options['ordered']
+    totals = {'matched': 0, 'modified': 0, 'deleted': 0, 'errors': 0}
+    processed = 0
+
+    for number, ids in enumerate(iter_id_chunks(collection, options['query'], options['chunk_size']), 1):
+        progress = {'chunk': number, 'size': len(ids)}
+        try:
+            result = collection.bulk_write(chunk_operations(action, ids, options['changes']), ordered=ordered)
+            details = result.bulk_api_result
+        except BulkWriteError as e:
+            details = e.details
+            progress['errors'] = [
+                {'index': error['index'], 'message': error.get('errmsg')} for error in details.get('writeErrors', [])
+            ]
+            totals['errors'] += len(progress['errors'])
+
+        progress.update({
+            'matched': details.get('nMatched', 0),
+            'modified': details.get('nModified', 0),
+            'deleted': details.get('nRemoved', 0)
+        })
+        for key in ('matched', 'modified', 'deleted'):
+            totals[key] += progress[key]
+        processed += len(ids)
+        progress['processed'] = processed
+
+        for user_id in ids:
+            user_cache.invalidate(user_id)
+        yield progress
+
+        if ordered and progress.get('errors'):
+            break
+
+    yield {'done': True, 'action': action, 'processed': processed, **totals}
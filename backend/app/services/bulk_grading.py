@@ -0,0 +1,169 @@
+import csv
+import io
+import json
+import sys
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+from bson import ObjectId
+
+from app.models.question import Question
+from app.models.score import Score
+from app.services.score_history import record_scores
+from app.services.jobs import enqueue_recommendation_recompute
+
+OPTION_FIELDS = ('option_a', 'option_b', 'option_c', 'option_d')
+OPTION_LETTERS = 'abcd'
+UNANSWERED = -1
+
+
+def read_answer_sheets(stream, fmt: str) -> List[Tuple[str, Dict[str, str]]]:
+    """Parse CSV or NDJSON answer sheets into (user_id, {question_id: selected}) pairs.
+
+    CSV sheets are wide: a `user_id` column followed by one column per question id.
+    NDJSON sheets use the `/api/submit-answers` body: {"user_id": ..., "answers": {...}}.
+    """
+    text = stream.read()
+    if isinstance(text, bytes):
+        text = text.decode('utf-8-sig')
+
+    sheets = []
+    if fmt == 'ndjson':
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            sheets.append((str(row['user_id']), row.get('answers', {})))
+    else:
+        for row in csv.DictReader(io.StringIO(text)):
+            user_id = row.pop('user_id')
+            sheets.append((user_id, {qid: value for qid, value in row.items() if value}))
+    return sheets
+
+
+def build_answer_key(questions: Iterable[Question]):
+    """Build the one-hot answer key (question index x option code) and per-question option lookups."""
+    question_ids, domains, lookups, key_rows = [], [], [], []
+    for q in questions:
+        options = [(getattr(q, field) or '').strip().lower() for field in OPTION_FIELDS]
+        lookup = {text: code for code, text in enumerate(options) if text}
+        lookup.update({letter: code for code, letter in enumerate(OPTION_LETTERS)})
+
+        row = np.zeros(len(OPTION_FIELDS), dtype=bool)
+        correct = (q.correct_answer or '').strip().lower()
+        if correct in lookup:
+            row[lookup[correct]] = True
+
+        question_ids.append(str(q.id))
+        domains.append(q.domain)
+        lookups.append(lookup)
+        key_rows.append(row)
+
+    key = np.vstack(key_rows) if key_rows else np.zeros((0, len(OPTION_FIELDS)), dtype=bool)
+    return question_ids, domains, lookups, key
+
+
+def encode_responses(sheets, question_ids, lookups) -> np.ndarray:
+    """Encode selected options into a (student x question) int8 matrix of option codes."""
+    column = {qid: i for i, qid in enumerate(question_ids)}
+    responses = np.full((len(sheets), len(question_ids)), UNANSWERED, dtype=np.int8)
+    for s, (_, answers) in enumerate(sheets):
+        for qid, selected in answers.items():
+            q = column.get(str(qid))
+            if q is None or selected is None:
+                continue
+            responses[s, q] = lookups[q].get(str(selected).strip().lower(), UNANSWERED)
+    return responses
+
+
+def grade_responses(responses: np.ndarray, key: np.ndarray) -> np.ndarray:
+    """Grade every sheet in one vectorized pass; returns a boolean (student x question) matrix."""
+    answered = responses != UNANSWERED
+    picked = key[np.arange(key.shape[0])[None, :], np.where(answered, responses, 0)]
+    return picked & answered
+
+
+def item_statistics(correct: np.ndarray, question_ids: List[str]) -> List[Dict]:
+    """Per-question p-value (proportion correct) and corrected point-biserial discrimination."""
+    if correct.shape[0] == 0:
+        return []
+
+    items = correct.astype(np.float64)
+    totals = items.sum(axis=1)
+    rest = totals[:, None] - items
+
+    p_values = items.mean(axis=0)
+    item_centered = items - p_values
+    rest_centered = rest - rest.mean(axis=0)
+    denom = np.sqrt((item_centered ** 2).sum(axis=0) * (rest_centered ** 2).sum(axis=0))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        discrimination = (item_centered * rest_centered).sum(axis=0) / denom
+
+    return [
+        {
+            "question_id": qid,
+            "p_value": round(float(p), 4),
+            "discrimination": None if np.isnan(d) else round(float(d), 4)
+        } for qid, p, d in zip(question_ids, p_values, discrimination)
+    ]
+
+
+def grade_cohort(sheets, domain: str, save: bool = True) -> Dict:
+    """Grade a cohort's answer sheets, bulk insert their Scores and return summary + item stats."""
+    asked = {str(qid) for _, answers in sheets for qid in answers if ObjectId.is_valid(str(qid))}
+    question_ids, domains, lookups, key = build_answer_key(Question.objects(id__in=list(asked)))
+
+    responses = encode_responses(sheets, question_ids, lookups)
+    correct = grade_responses(responses, key)
+    totals = correct.sum(axis=1)
+
+    domain_names = sorted(set(domains))
+    domain_index = np.array([domain_names.index(d) for d in domains], dtype=np.intp)
+    domain_matrix = np.eye(len(domain_names), dtype=np.int32)[domain_index]
+    per_domain = correct.astype(np.int32) @ domain_matrix
+    domain_sizes = domain_matrix.sum(axis=0)
+
+    if save and sheets:
+        now = datetime.utcnow()
+        skill_scores = [
+            {
+                name: round(100.0 * per_domain[s, d] / domain_sizes[d], 2)
+                for d, name in enumerate(domain_names)
+            } for s in range(len(sheets))
+        ]
+        Score.objects.insert([
+            Score(user_id=user_id, domain=domain, skill_scores=skills, submitted_at=now)
+            for (user_id, _), skills in zip(sheets, skill_scores)
+        ], load_bulk=False)
+        record_scores((user_id, domain, skills, now) for (user_id, _), skills in zip(sheets, skill_scores))
+        for user_id, _ in sheets:
+            enqueue_recommendation_recompute(user_id)
+
+    return {
+        "graded": len(sheets),
+        "questions": len(question_ids),
+        "scores": [
+            {"user_id": user_id, "score": int(total)}
+            for (user_id, _), total in zip(sheets, totals)
+        ],
+        "items": item_statistics(correct, question_ids)
+    }
+
+
+if __name__ == '__main__':
+    import argparse
+    from app.utils.db import connect_db
+
+    parser = argparse.ArgumentParser(description="Grade a cohort's answer sheets in bulk.")
+    parser.add_argument('path', help="CSV or NDJSON answer sheet file")
+    parser.add_argument('--domain', default='cohort')
+    parser.add_argument('--format', choices=['csv', 'ndjson'])
+    parser.add_argument('--dry-run', action='store_true', help="Grade without saving scores")
+    args = parser.parse_args()
+
+    fmt = args.format or ('ndjson' if args.path.endswith(('.ndjson', '.jsonl')) else 'csv')
+    connect_db()
+    with open(args.path, 'rb') as f:
+        report = grade_cohort(read_answer_sheets(f, fmt), args.domain, save=not args.dry_run)
+    json.dump(report, sys.stdout, indent=2)
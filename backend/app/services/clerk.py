@@ -0,0 +1,21 @@
+import os
+
+CLERK_SECRET_KEY = os.getenv('CLERK_SECRET_KEY') # Store this securely
+CLERK_API_URL = os.getenv('CLERK_API_URL', 'https://api.clerk.com/v1')
+
+
+def clerk_metadata_request(user_id, interests, skills):
+    """URL, headers and body of the Clerk PATCH that stores interests/skills in public metadata."""
+    return (
+        f'{CLERK_API_URL}/users/{user_id}',
+        {
+            'Authorization': f'Bearer {CLERK_SECRET_KEY}',
+            'Content-Type': 'application/json'
+        },
+        {
+            'public_metadata': {
+                'interests': interests,
+                'skills': skills
+            }
+        }
+    )
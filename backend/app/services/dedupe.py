@@ -0,0 +1,206 @@
+import hashlib
+import os
+import re
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from app.models.question import Question
+
+NUM_PERM = 64
+BANDS = 16  # 16 bands of 4 rows: pairs above ~0.5 Jaccard almost always share a band
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 5
+DEDUPE_THRESHOLD = float(os.getenv('DEDUPE_THRESHOLD', 0.8))
+DEDUPE_ACTIONS = ('skip', 'merge', 'flag', 'off')
+DEFAULT_ACTION = os.getenv('DEDUPE_ACTION', 'skip')
+MAX_REPORTED_MATCHES = 100
+
+_PRIME = np.uint64(4294967311)  # smallest prime above 2**32
+# Fixed seed: signatures are stored, so every process must hash with the same permutations
+_random = np.random.default_rng(20240601)
+_A = _random.integers(1, 2 ** 31, NUM_PERM, dtype=np.uint64)[:, None]
+_B = _random.integers(0, 2 ** 31, NUM_PERM, dtype=np.uint64)[:, None]
+
+NORMALIZE_RE = re.compile(r"[^a-z0-9]+")
+
+
+def lsh_collection():
+    """One document per indexed question: {_id: question id, bands, signature, duplicate_of?}."""
+    collection = Question._get_collection().database['question_lsh']
+    collection.create_index('bands')
+    return collection
+
+
+def normalize(text: str) -> str:
+    return NORMALIZE_RE.sub(' ', (text or '').lower()).strip()
+
+
+def fingerprint_text(fields: Dict) -> str:
+    """Question text plus its options in sorted order, so punctuation and option order do not matter."""
+    options = sorted(normalize(fields.get(key)) for key in ('option_a', 'option_b', 'option_c', 'option_d'))
+    return ' | '.join([normalize(fields.get('question'))] + options)
+
+
+def signature(fields: Dict) -> np.ndarray:
+    text = fingerprint_text(fields)
+    shingles = {text[i:i + SHINGLE_SIZE] for i in range(max(1, len(text) - SHINGLE_SIZE + 1))}
+    hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles), dtype=np.uint64, count=len(shingles))
+    return ((_A * hashes + _B) % _PRIME).min(axis=1)
+
+
+def band_keys(sig: np.ndarray) -> List[str]:
+    return [
+        f"{band}:{hashlib.blake2b(sig[band * ROWS:(band + 1) * ROWS].tobytes(), digest_size=8).hexdigest()}"
+        for band in range(BANDS)
+    ]
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the two shingle sets."""
+    return float(np.mean(a == b))
+
+
+class DuplicateDetector:
+    """Checks each batch of incoming questions against the stored LSH index and against itself.
+
+    Candidates come from a single indexed `$in` lookup on the batch's band keys, so the cost of a
+    check depends on how many near neighbours exist, not on the size of the bank. Candidates are
+    confirmed by comparing full signatures against DEDUPE_THRESHOLD.
+    """
+
+    def __init__(self, action: str = DEFAULT_ACTION, threshold: float = DEDUPE_THRESHOLD):
+        if action not in DEDUPE_ACTIONS:
+            raise ValueError(f"Unknown duplicate action: {action}")
+        self.action = action
+        self.threshold = threshold
+        self.collection = lsh_collection() if action != 'off' else None
+        self.report = {'action': action, 'skipped': 0, 'merged': 0, 'flagged': 0, 'matches': []}
+
+    def _record(self, row: int, duplicate_of, score: float):
+        self.report[{'skip': 'skipped', 'merge': 'merged', 'flag': 'flagged'}[self.action]] += 1
+        if len(self.report['matches']) < MAX_REPORTED_MATCHES:
+            self.report['matches'].append({'row': row, 'duplicate_of': str(duplicate_of), 'similarity': round(score, 3)})
+
+    def _best_match(self, sig, keys, stored: Dict, by_band: Dict) -> Tuple[Optional[object], float]:
+        best, best_score = None, 0.0
+        seen = set()
+        for key in keys:
+            for candidate in by_band.get(key, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                score = similarity(sig, stored[candidate])
+                if score >= self.threshold and score > best_score:
+                    best, best_score = candidate, score
+        return best, best_score
+
+    def process(self, documents: List[Dict], rows: List[int]):
+        """Insert a parsed batch, applying the duplicate action; returns the number of new questions."""
+        questions = Question._get_collection()
+        if self.action == 'off':
+            if documents:
+                questions.insert_many(documents, ordered=False)
+            return len(documents)
+
+        signatures = [signature(doc) for doc in documents]
+        keys = [band_keys(sig) for sig in signatures]
+
+        # Existing neighbours of anything in the batch, from one index lookup
+        stored, by_band = {}, {}
+        wanted = {key for doc_keys in keys for key in doc_keys}
+        for entry in self.collection.find({'bands': {'$in': list(wanted)}}, {'bands': 1, 'signature': 1}):
+            stored[entry['_id']] = np.array(entry['signature'], dtype=np.uint64)
+            for key in entry['bands']:
+                if key in wanted:
+                    by_band.setdefault(key, []).append(entry['_id'])
+
+        to_insert, writes = [], []  # (document, signature, keys, duplicate_of) / updates of matched questions
+        pending_rows = {}
+        for doc, sig, doc_keys, row in zip(documents, signatures, keys, rows):
+            match, score = self._best_match(sig, doc_keys, stored, by_band)
+            if match is None:
+                # Earlier rows of the same batch are candidates too, keyed by their insert position
+                pending = ('pending', len(to_insert))
+                pending_rows[pending] = row
+                to_insert.append((doc, sig, doc_keys, None))
+                stored[pending] = sig
+                for key in doc_keys:
+                    by_band.setdefault(key, []).append(pending)
+                continue
+
+            self._record(row, f"row {pending_rows[match]}" if isinstance(match, tuple) else match, score)
+            if self.action == 'flag':
+                to_insert.append((doc, sig, doc_keys, match))
+            elif self.action == 'merge':
+                if isinstance(match, tuple):
+                    to_insert[match[1]][0].update({k: v for k, v in doc.items() if v})
+                else:
+                    writes.append(UpdateOne({'_id': match}, {'$set': {k: v for k, v in doc.items() if v}}))
+
+        if writes:
+            questions.bulk_write(writes, ordered=False)
+        if not to_insert:
+            return 0
+
+        inserted = questions.insert_many([item[0] for item in to_insert], ordered=True).inserted_ids
+        ids = dict(enumerate(inserted))
+        entries = []
+        for question_id, (doc, sig, doc_keys, duplicate_of) in zip(inserted, to_insert):
+            entry = {'_id': question_id, 'bands': doc_keys, 'signature': sig.tolist()}
+            if duplicate_of is not None:
+                entry['duplicate_of'] = ids[duplicate_of[1]] if isinstance(duplicate_of, tuple) else duplicate_of
+            entries.append(InsertOne(entry))
+        self.collection.bulk_write(entries, ordered=False)
+        return len(inserted)
+
+
+def _insert_entries(collection, entries: List) -> int:
+    try:
+        return collection.bulk_write(entries, ordered=False).inserted_count
+    except BulkWriteError as e:
+        # Questions that are already indexed fail on the _id key and are simply left alone
+        return e.details.get('nInserted', 0)
+
+
+def backfill(batch_size: int = 1000) -> int:
+    """Index questions that were stored before deduplication existed (or were inserted around it)."""
+    collection = lsh_collection()
+    fields = dict.fromkeys(('question', 'option_a', 'option_b', 'option_c', 'option_d'), 1)
+    pending, added = [], 0
+    for doc in Question._get_collection().find({}, fields).batch_size(batch_size):
+        sig = signature(doc)
+        pending.append(InsertOne({'_id': doc['_id'], 'bands': band_keys(sig), 'signature': sig.tolist()}))
+        if len(pending) == batch_size:
+            added += _insert_entries(collection, pending)
+            pending = []
+    if pending:
+        added += _insert_entries(collection, pending)
+    return added
+
+
+def flagged_duplicates(limit: int = 100) -> List[Dict]:
+    return [
+        {'question_id': str(entry['_id']), 'duplicate_of': str(entry['duplicate_of'])}
+        for entry in lsh_collection().find({'duplicate_of': {'$exists': True}}, {'duplicate_of': 1}).limit(limit)
+    ]
+
+
+if __name__ == '__main__':
+    import argparse
+    import json
+    from app.utils.db import connect_db
+
+    parser = argparse.ArgumentParser(description='Near-duplicate question index')
+    parser.add_argument('command', choices=('backfill', 'flagged'))
+    parser.add_argument('--limit', type=int, default=100)
+    args = parser.parse_args()
+
+    connect_db()
+    if args.command == 'backfill':
+        print(f"[✓] Indexed {backfill()} questions")
+    else:
+        print(json.dumps(flagged_duplicates(args.limit), indent=2))
@@ -0,0 +1,15 @@
+import os
+
+INNGEST_EVENT_URL = os.getenv('INNGEST_EVENT_URL', "https://api.inngest.com/e")  # Inngest event endpoint
+INNGEST_APP_NAME = "test/score.submitted"        # Event name
+
+
+def inngest_payload(content: dict) -> dict:
+    """Build the Inngest event for a `/api/inngest` request body."""
+    event_name = content.get("name", INNGEST_APP_NAME)
+    data = content.get("data", {})
+    return {
+        "name": event_name,
+        "data": data,
+        "user": { "id": data.get("userId") }
+    }
@@ -0,0 +1,140 @@
+import csv
+import io
+import json
+import sys
+from typing import Callable, Dict, Iterator, List, NamedTuple
+
+from app.models.question import Question
+from app.models.recommendation import Recommendation
+from app.models.score import Score
+from app.services.question_import import QUESTION_COLUMNS
+
+EXPORT_FORMATS = ('csv', 'ndjson')
+DEFAULT_BATCH_SIZE = 1000
+MAX_BATCH_SIZE = 10000
+FLUSH_ROWS = 500  # rows buffered per yielded chunk
+
+
+class Dataset(NamedTuple):
+    model: type
+    columns: List[str]  # CSV header, in order
+    fields: Dict[str, str]  # CSV column -> document field
+    filters: Dict[str, str]  # accepted filter parameter -> document field
+
+
+# Question columns are exactly the upload format, so an exported CSV can be uploaded again
+DATASETS = {
+    'questions': Dataset(
+        Question,
+        list(QUESTION_COLUMNS),
+        QUESTION_COLUMNS,
+        {'domain': 'domain'}
+    ),
+    'scores': Dataset(
+        Score,
+        ['id', 'user_id', 'domain', 'skill_scores', 'submitted_at'],
+        {'id': '_id', 'user_id': 'user_id', 'domain': 'domain', 'skill_scores': 'skill_scores',
+         'submitted_at': 'submitted_at'},
+        {'user_id': 'user_id', 'domain': 'domain'}
+    ),
+    'recommendations': Dataset(
+        Recommendation,
+        ['id', 'user', 'category', 'title', 'url', 'description', 'tags', 'source', 'score', 'created_at'],
+        {'id': '_id', 'user': 'user', 'category': 'category', 'title': 'title', 'url': 'url',
+         'description': 'description', 'tags': 'tags', 'source': 'source', 'score': 'score',
+         'created_at': 'created_at'},
+        {'user_id': 'user', 'category': 'category'}
+    ),
+}
+
+
+def csv_value(value) -> str:
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def export_cursor(name: str, params: Dict = None, batch_size: int = DEFAULT_BATCH_SIZE):
+    """Raw cursor over the dataset: projected to the exported fields and read in `batch_size` batches."""
+    dataset = DATASETS[name]
+    query = {
+        field: params[param] for param, field in dataset.filters.items()
+        if params and params.get(param)
+    }
+    projection = dict.fromkeys(dataset.fields.values(), 1)
+    batch_size = max(1, min(int(batch_size), MAX_BATCH_SIZE))
+    # Natural order: nothing for the server to sort and buffer before the first batch
+    return dataset.model._get_collection().find(query, projection).batch_size(batch_size)
+
+
+def iter_csv(name: str, cursor) -> Iterator[str]:
+    dataset = DATASETS[name]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(dataset.columns)
+    rows = 0
+    for doc in cursor:
+        writer.writerow([csv_value(doc.get(dataset.fields[column])) for column in dataset.columns])
+        rows += 1
+        if rows % FLUSH_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def iter_ndjson(name: str, cursor) -> Iterator[str]:
+    lines = []
+    for doc in cursor:
+        doc['id'] = str(doc.pop('_id'))
+        lines.append(json.dumps(doc, default=str))
+        if len(lines) == FLUSH_ROWS:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+EXPORTERS: Dict[str, Callable] = {'csv': iter_csv, 'ndjson': iter_ndjson}
+
+
+def export_rows(name: str, export_format: str = 'csv', params: Dict = None,
+                batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[str]:
+    """Stream a dataset as text chunks; memory is bounded by one cursor batch plus one flush."""
+    if name not in DATASETS:
+        raise ValueError(f"Unknown dataset: {name}")
+    if export_format not in EXPORTERS:
+        raise ValueError(f"Unknown format: {export_format}")
+    cursor = export_cursor(name, params, batch_size)
+    try:
+        yield from EXPORTERS[export_format](name, cursor)
+    finally:
+        cursor.close()
+
+
+if __name__ == '__main__':
+    import argparse
+    from app.utils.db import connect_db
+
+    parser = argparse.ArgumentParser(description='Export questions, scores or recommendations')
+    parser.add_argument('dataset', choices=sorted(DATASETS))
+    parser.add_argument('--format', choices=EXPORT_FORMATS, default='csv')
+    parser.add_argument('--output', '-o', help='file to write (default: stdout)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--filter', action='append', default=[], metavar='KEY=VALUE',
+                        help='e.g. domain=Python or user_id=<id>; repeatable')
+    args = parser.parse_args()
+
+    connect_db()
+    filters = dict(item.split('=', 1) for item in args.filter)
+    out = open(args.output, 'w', encoding='utf-8', newline='') if args.output else sys.stdout
+    try:
+        for chunk in export_rows(args.dataset, args.format, filters, args.batch_size):
+            out.write(chunk)
+    finally:
+        if out is not sys.stdout:
+            out.close()
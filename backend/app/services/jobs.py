@@ -0,0 +1,253 @@
+import os
+import socket
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional
+
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.models.score import Score
+from app.utils.metrics import metrics
+
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', 2))
+POLL_SECONDS = float(os.getenv('JOB_POLL_SECONDS', 1))
+MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', 5))
+RETRY_BASE_SECONDS = 5  # doubled on every attempt
+LEASE_SECONDS = 300  # a running job older than this is assumed lost with its worker
+HOUSEKEEPING_SECONDS = 5  # how often the depth gauge is refreshed and expired leases are released
+RETENTION_DAYS = int(os.getenv('JOB_RETENTION_DAYS', 7))  # finished jobs (done, failed, superseded) are kept this long
+
+HANDLERS: Dict[str, Callable] = {}
+_indexed = False
+
+
+def job_handler(kind: str):
+    """Register the function that runs jobs of `kind`; it receives the job payload as keyword arguments."""
+    def register(f):
+        HANDLERS[kind] = f
+        return f
+    return register
+
+
+def jobs_collection():
+    """{kind, key, payload, status: pending|running|done|failed, attempts, run_at, created_at, ...}
+
+    The partial unique index on `key` allows one pending job per key, which is how repeated
+    triggers for the same user collapse into a single recompute. Every finished job gets a
+    `finished_at`, which the TTL index uses to remove it after RETENTION_DAYS.
+    """
+    global _indexed
+    collection = Score._get_collection().database['jobs']
+    if not _indexed:
+        collection.create_index('key', unique=True, partialFilterExpression={'status': 'pending'})
+        collection.create_index([('status', ASCENDING), ('run_at', ASCENDING)])
+        collection.create_index('finished_at', expireAfterSeconds=RETENTION_DAYS * 86400)
+        _indexed = True
+    return collection
+
+
+def enqueue(kind: str, key: str = None, **payload) -> bool:
+    """Queue a job unless one with the same key is already pending; returns True if a job was added."""
+    now = datetime.utcnow()
+    job = {'kind': kind, 'payload': payload, 'attempts': 0, 'run_at': now, 'created_at': now}
+    try:
+        if key is None:
+            jobs_collection().insert_one({**job, 'status': 'pending'})
+            added = True
+        else:
+            result = jobs_collection().update_one(
+                {'key': key, 'status': 'pending'}, {'$setOnInsert': job}, upsert=True
+            )
+            added = result.upserted_id is not None
+    except DuplicateKeyError:
+        added = False  # a concurrent enqueue won the race
+    except Exception as e:
+        print(f"Error enqueueing {kind} job: {str(e)}")
+        return False
+    metrics.inc('jobs_enqueued_total', kind=kind, outcome='added' if added else 'deduplicated')
+    return added
+
+
+class JobWorkerPool:
+    """Worker threads that claim pending jobs with an atomic find_one_and_update and run them.
+
+    Failures are retried with exponential backoff up to MAX_ATTEMPTS; jobs whose worker died are
+    picked up again once their lease expires.
+    """
+
+    def __init__(self, workers: int = JOB_WORKERS):
+        self.workers = workers
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._stop = threading.Event()
+        self._threads = []
+        self._busy = 0
+        self._lock = threading.Lock()
+        self._housekeeping_at = 0.0
+
+    def start(self):
+        if self._threads or self.workers <= 0:
+            return
+        self._stop.clear()
+        for number in range(self.workers):
+            thread = threading.Thread(target=self._loop, name=f'job-worker-{number}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        print(f"[✓] Job queue: {self.workers} workers started")
+
+    def stop(self, timeout: float = 10):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _set_busy(self, delta: int):
+        with self._lock:
+            self._busy += delta
+            busy = self._busy
+        metrics.set('jobs_workers_busy', busy)
+        metrics.set('jobs_worker_utilization', round(busy / self.workers, 4))
+
+    def _housekeeping(self, collection):
+        if time.monotonic() - self._housekeeping_at < HOUSEKEEPING_SECONDS:
+            return
+        self._housekeeping_at = time.monotonic()
+        now = datetime.utcnow()
+        # Jobs stuck in `running` past their lease go back to the queue, one by one so that a job
+        # whose key already has a newer pending job is superseded instead of failing the whole batch
+        expired = collection.find(
+            {'status': 'running', 'started_at': {'$lt': now - timedelta(seconds=LEASE_SECONDS)}},
+            {'kind': 1}
+        )
+        for job in expired:
+            try:
+                collection.update_one(
+                    {'_id': job['_id'], 'status': 'running'}, {'$set': {'status': 'pending', 'run_at': now}}
+                )
+                metrics.inc('jobs_total', kind=job['kind'], outcome='lease_expired')
+            except DuplicateKeyError:
+                collection.update_one(
+                    {'_id': job['_id']}, {'$set': {'status': 'done', 'error': 'superseded', 'finished_at': now}}
+                )
+                metrics.inc('jobs_total', kind=job['kind'], outcome='superseded')
+        metrics.set('jobs_queue_depth', collection.count_documents({'status': 'pending'}))
+
+    def claim(self, collection) -> Optional[Dict]:
+        now = datetime.utcnow()
+        return collection.find_one_and_update(
+            {'status': 'pending', 'run_at': {'$lte': now}},
+            {'$set': {'status': 'running', 'started_at': now, 'worker': self.worker_id}, '$inc': {'attempts': 1}},
+            sort=[('run_at', ASCENDING)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    def run_job(self, collection, job: Dict):
+        kind = job['kind']
+        metrics.observe('job_wait_seconds', (job['started_at'] - job['created_at']).total_seconds(), kind=kind)
+        started = time.perf_counter()
+        try:
+            handler = HANDLERS.get(kind)
+            if handler is None:
+                raise LookupError(f"No handler for job kind {kind}")
+            handler(**job['payload'])
+        except Exception as e:
+            self._fail(collection, job, e)
+            return
+        finally:
+            metrics.observe('job_run_seconds', time.perf_counter() - started, kind=kind)
+
+        collection.update_one({'_id': job['_id']}, {'$set': {'status': 'done', 'finished_at': datetime.utcnow()}})
+        metrics.inc('jobs_total', kind=kind, outcome='done')
+
+    def _fail(self, collection, job: Dict, error: Exception):
+        kind = job['kind']
+        print(f"Error running {kind} job {job['_id']} (attempt {job['attempts']}): {str(error)}")
+        if job['attempts'] >= MAX_ATTEMPTS:
+            collection.update_one(
+                {'_id': job['_id']}, {'$set': {'status': 'failed', 'error': str(error), 'finished_at': datetime.utcnow()}}
+            )
+            metrics.inc('jobs_total', kind=kind, outcome='failed')
+            return
+        retry_at = datetime.utcnow() + timedelta(seconds=RETRY_BASE_SECONDS * 2 ** (job['attempts'] - 1))
+        try:
+            collection.update_one(
+                {'_id': job['_id']}, {'$set': {'status': 'pending', 'run_at': retry_at, 'error': str(error)}}
+            )
+            metrics.inc('jobs_total', kind=kind, outcome='retried')
+        except DuplicateKeyError:
+            # A newer job for the same key is already pending and will do the same work
+            collection.update_one(
+                {'_id': job['_id']},
+                {'$set': {'status': 'done', 'error': 'superseded', 'finished_at': datetime.utcnow()}}
+            )
+            metrics.inc('jobs_total', kind=kind, outcome='superseded')
+
+    def _loop(self):
+        collection = jobs_collection()
+        while not self._stop.is_set():
+            try:
+                self._housekeeping(collection)
+                job = self.claim(collection)
+            except Exception as e:
+                print(f"Error polling job queue: {str(e)}")
+                job = None
+            if job is None:
+                self._stop.wait(POLL_SECONDS)
+                continue
+            self._set_busy(1)
+            try:
+                self.run_job(collection, job)
+            finally:
+                self._set_busy(-1)
+
+
+job_pool = JobWorkerPool()
+
+
+@job_handler('recommendations.recompute')
+def recompute_recommendations(user_id: str):
+    from app.services.batch_recommendations import recompute_user
+    recompute_user(user_id)
+
+
+def enqueue_recommendation_recompute(user_id: str) -> bool:
+    """Ask the workers to refresh a user's catalog recommendations (at most one pending per user)."""
+    return enqueue('recommendations.recompute', key=f'recommendations.recompute:{user_id}', user_id=str(user_id))
+
+
+@job_handler('recommendations.compact')
+def compact_recommendations(batch_size: int, pause: float):
+    from app.services.recommendation_store import compact
+    compact(batch_size, pause)
+
+
+def enqueue_recommendation_compaction(batch_size: int, pause: float) -> bool:
+    """Queue a throttled dedupe/backfill pass over the recommendation collection (at most one pending).
+
+    A pass longer than LEASE_SECONDS is handed to another worker, so run very large collections
+    through the recommendation_store CLI instead.
+    """
+    return enqueue('recommendations.compact', key='recommendations.compact', batch_size=batch_size, pause=pause)
+
+
+if __name__ == '__main__':
+    import argparse
+    import signal
+    from app.utils.db import connect_db
+
+    parser = argparse.ArgumentParser(description='Run job queue workers in the foreground')
+    parser.add_argument('--workers', type=int, default=JOB_WORKERS)
+    args = parser.parse_args()
+
+    connect_db()
+    pool = JobWorkerPool(args.workers)
+    pool.start()
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopping.set())
+    try:
+        while not stopping.wait(1):
+            pass
+    except KeyboardInterrupt:
+        pass
+    pool.stop()
@@ -0,0 +1,243 @@
+"""Per-request profiling and slow-request log.
+
+Nothing is installed unless one of these is set, so requests pay nothing when profiling is off:
+
+    PROFILE_SECRET        enables `X-Profile: <expires>.<signature>` headers (see `sign_token`)
+    PROFILE_SAMPLE_RATE   fraction of requests profiled at random, e.g. 0.01
+    SLOW_REQUEST_MS       log every request slower than this with its Mongo/HTTP call timings
+
+Profiles are written to PROFILE_DIR: `.folded` collapsed stacks from the sampling profiler
+(flamegraph.pl, speedscope) or `.pstats` from cProfile when `X-Profile-Mode: cprofile` is sent.
+"""
+import contextvars
+import cProfile
+import hashlib
+import hmac
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+from app.utils.metrics import metrics
+
+PROFILE_SECRET = os.getenv('PROFILE_SECRET', '')
+PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', 0))
+SLOW_REQUEST_MS = float(os.getenv('SLOW_REQUEST_MS', 0))
+PROFILE_DIR = os.getenv('PROFILE_DIR', os.path.join(os.path.dirname(__file__), '..', '..', 'profiles'))
+SLOW_REQUEST_LOG = os.getenv('SLOW_REQUEST_LOG', '')  # JSON lines file; stdout when unset
+SAMPLE_INTERVAL = 0.005
+MAX_CALLS_LOGGED = 500
+
+PROFILING_ENABLED = bool(PROFILE_SECRET or PROFILE_SAMPLE_RATE > 0 or SLOW_REQUEST_MS > 0)
+
+current_trace = contextvars.ContextVar('request_trace', default=None)
+
+
+def sign_token(expires: int) -> str:
+    signature = hmac.new(PROFILE_SECRET.encode(), str(expires).encode(), hashlib.sha256).hexdigest()
+    return f"{expires}.{signature}"
+
+
+def valid_token(token: str) -> bool:
+    if not PROFILE_SECRET or not token or '.' not in token:
+        return False
+    expires, _, _ = token.partition('.')
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    return hmac.compare_digest(sign_token(int(expires)), token)
+
+
+class StackSampler:
+    """Samples one thread's Python stack every SAMPLE_INTERVAL into collapsed-stack counts."""
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def stop(self) -> str:
+        self._stop.set()
+        self._thread.join()
+        return '\n'.join(f"{stack} {count}" for stack, count in self.stacks.items()) + '\n'
+
+
+class RequestTrace:
+    def __init__(self, method: str, path: str, mode: str = None):
+        self.method = method
+        self.path = path
+        self.mode = mode  # None: timings only; 'sample' or 'cprofile': also profile
+        self.started = time.perf_counter()
+        self.calls = []
+        self.pending = {}
+        self.profiler = None
+        if mode == 'cprofile':
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        elif mode == 'sample':
+            self.profiler = StackSampler(threading.get_ident())
+            self.profiler.start()
+
+    def record(self, kind: str, name: str, seconds: float, **details):
+        if len(self.calls) < MAX_CALLS_LOGGED:
+            self.calls.append({'kind': kind, 'name': name, 'ms': round(seconds * 1000, 3), **details})
+
+    def finish(self, status: int):
+        elapsed_ms = (time.perf_counter() - self.started) * 1000
+        profile_file = None
+        if self.profiler is not None:
+            if self.mode == 'cprofile':
+                self.profiler.disable()
+            else:
+                folded = self.profiler.stop()
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            stem = f"{datetime.utcnow():%Y%m%dT%H%M%S%f}-{self.method}-{self.path.strip('/').replace('/', '_') or 'root'}"
+            if self.mode == 'cprofile':
+                profile_file = os.path.join(PROFILE_DIR, f"{stem}.pstats")
+                self.profiler.dump_stats(profile_file)
+            else:
+                profile_file = os.path.join(PROFILE_DIR, f"{stem}.folded")
+                with open(profile_file, 'w') as f:
+                    f.write(folded)
+            metrics.inc('profiled_requests_total', mode=self.mode)
+
+        if profile_file or (SLOW_REQUEST_MS and elapsed_ms >= SLOW_REQUEST_MS):
+            by_kind = {}
+            for call in self.calls:
+                by_kind[call['kind']] = round(by_kind.get(call['kind'], 0) + call['ms'], 3)
+            write_slow_log({
+                'at': datetime.utcnow().isoformat(),
+                'method': self.method,
+                'path': self.path,
+                'status': status,
+                'ms': round(elapsed_ms, 3),
+                'totals_ms': by_kind,
+                'calls': self.calls,
+                'profile': profile_file
+            })
+            metrics.inc('slow_requests_total')
+        return profile_file
+
+
+def write_slow_log(entry):
+    line = json.dumps(entry, default=str)
+    if not SLOW_REQUEST_LOG:
+        print(line)
+        return
+    with open(SLOW_REQUEST_LOG, 'a', encoding='utf-8') as f:
+        f.write(line + '\n')
+
+
+def _install_mongo_listener():
+    from pymongo import monitoring
+
+    class CommandTimer(monitoring.CommandListener):
+        # Sync PyMongo calls these on the thread that issued the command, so the context var is the request's
+        def started(self, event):
+            trace = current_trace.get()
+            if trace is not None:
+                trace.pending[event.request_id] = (event.command_name, event.database_name,
+                                                   event.command.get(event.command_name))
+
+        def _done(self, event, ok):
+            trace = current_trace.get()
+            if trace is None:
+                return
+            command, database, target = trace.pending.pop(event.request_id, (event.command_name, None, None))
+            trace.record('mongo', command, event.duration_micros / 1e6, database=database,
+                         collection=target if isinstance(target, str) else None, ok=ok)
+
+        def succeeded(self, event):
+            self._done(event, True)
+
+        def failed(self, event):
+            self._done(event, False)
+
+    # Only clients created after this call are monitored, hence the early import in app.py
+    monitoring.register(CommandTimer())
+
+
+def _install_http_timer():
+    import requests
+
+    send = requests.Session.send
+
+    def timed_send(session, request, **kwargs):
+        trace = current_trace.get()
+        if trace is None:
+            return send(session, request, **kwargs)
+        started = time.perf_counter()
+        status = None
+        try:
+            response = send(session, request, **kwargs)
+            status = response.status_code
+            return response
+        finally:
+            host = request.url.split('/')[2] if '://' in request.url else request.url
+            trace.record('http', f"{request.method} {host}", time.perf_counter() - started, status=status)
+
+    requests.Session.send = timed_send
+
+
+if PROFILING_ENABLED:
+    _install_mongo_listener()
+    _install_http_timer()
+
+
+def install_profiling(app):
+    """Attach the per-request hooks to a Flask app; a no-op unless profiling is configured."""
+    if not PROFILING_ENABLED:
+        return
+    from flask import request, g
+
+    @app.before_request
+    def start_trace():
+        mode = None
+        if valid_token(request.headers.get('X-Profile')) or (
+                PROFILE_SAMPLE_RATE and random.random() < PROFILE_SAMPLE_RATE):
+            mode = 'cprofile' if request.headers.get('X-Profile-Mode') == 'cprofile' else 'sample'
+        elif not SLOW_REQUEST_MS:
+            return
+        trace = RequestTrace(request.method, request.path, mode)
+        g.request_trace = (trace, current_trace.set(trace))
+
+    @app.after_request
+    def finish_trace(response):
+        traced = g.pop('request_trace', None)
+        if traced is not None:
+            trace, token = traced
+            current_trace.reset(token)
+            profile_file = trace.finish(response.status_code)
+            if profile_file:
+                response.headers['X-Profile-File'] = os.path.basename(profile_file)
+        return response
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Print a signed X-Profile header value')
+    parser.add_argument('--ttl', type=int, default=600, help='seconds the token stays valid')
+    args = parser.parse_args()
+    if not PROFILE_SECRET:
+        sys.exit('PROFILE_SECRET is not set')
+    print(f"X-Profile: {sign_token(int(time.time()) + args.ttl)}")
@@ -0,0 +1,155 @@
+import codecs
+import csv
+import io
+import os
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from charset_normalizer import from_bytes
+
+from app.services.dedupe import DuplicateDetector, DEFAULT_ACTION
+
+IMPORT_BATCH_SIZE = int(os.getenv('QUESTION_IMPORT_BATCH_SIZE', 1000))
+SNIFF_BYTES = 64 * 1024
+MAX_REPORTED_ERRORS = 100
+
+# Upload column -> Question field. The CSV export writes these exact headers.
+QUESTION_COLUMNS = {
+    'Domain': 'domain',
+    'difficulty_level': 'difficulty_level',
+    'question': 'question',
+    'Option A': 'option_a',
+    'Option B': 'option_b',
+    'Option C': 'option_c',
+    'Option D': 'option_d',
+    'correct_answer': 'correct_answer',
+    'Badge': 'badge'
+}
+REQUIRED_FIELDS = [field for field in QUESTION_COLUMNS.values() if field != 'badge']
+
+# Headers as authors actually write them (e.g. the workbook's Level/Question/Answer), normalised
+HEADER_ALIASES = {
+    'domain': 'domain',
+    'level': 'difficulty_level',
+    'difficulty': 'difficulty_level',
+    'difficulty_level': 'difficulty_level',
+    'question': 'question',
+    'option_a': 'option_a',
+    'option_b': 'option_b',
+    'option_c': 'option_c',
+    'option_d': 'option_d',
+    'answer': 'correct_answer',
+    'correct_answer': 'correct_answer',
+    'badge': 'badge'
+}
+
+
+def header_field(header) -> Optional[str]:
+    key = str(header or '').strip().lower().replace(' ', '_').replace('-', '_')
+    return HEADER_ALIASES.get(key)
+
+
+def detect_encoding(stream) -> str:
+    """Guess a CSV upload's encoding from its first bytes, then rewind the stream."""
+    sample = stream.read(SNIFF_BYTES)
+    stream.seek(0)
+    if sample.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return 'utf-16'
+    try:
+        # A multi-byte character may be cut at the end of the sample, so decode incrementally
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+    match = from_bytes(sample).best()
+    return match.encoding if match else 'ISO-8859-1'
+
+
+def iter_csv_rows(stream) -> Iterator[Tuple]:
+    """(header, row) tuples decoded on the fly; the file is never read into memory whole."""
+    text = io.TextIOWrapper(stream, encoding=detect_encoding(stream), errors='replace', newline='')
+    try:
+        reader = csv.reader(text)
+        header = next(reader, None)
+        if header is None:
+            return
+        for row in reader:
+            yield header, row
+    finally:
+        text.detach()
+
+
+def iter_xlsx_rows(stream) -> Iterator[Tuple]:
+    """(header, row) tuples from the first sheet of a workbook opened read-only (rows are parsed lazily)."""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        for row in rows:
+            yield header, row
+    finally:
+        workbook.close()
+
+
+def iter_upload_rows(file) -> Iterator[Tuple]:
+    filename = (file.filename or '').lower()
+    if filename.endswith(('.xlsx', '.xlsm')):
+        return iter_xlsx_rows(file.stream)
+    return iter_csv_rows(file.stream)
+
+
+def parse_row(header, row) -> Tuple[Optional[Dict], Optional[str]]:
+    """Map one row onto Question fields; returns (fields, None) or (None, reason)."""
+    fields = {}
+    for column, value in zip(header, row):
+        field = header_field(column)
+        if field and value is not None:
+            fields[field] = str(value).strip()
+    if not any(fields.values()):
+        return None, None  # blank line
+    missing = [field for field in REQUIRED_FIELDS if not fields.get(field)]
+    if missing:
+        return None, f"missing {', '.join(missing)}"
+    fields.setdefault('badge', '')
+    return fields, None
+
+
+def import_questions(rows: Iterable[Tuple], batch_size: int = IMPORT_BATCH_SIZE,
+                     duplicates: str = DEFAULT_ACTION) -> Dict:
+    """Validate rows batch by batch and insert them through the near-duplicate detector.
+
+    Only one batch of parsed rows is held at a time, so memory stays flat however long the sheet is.
+    `duplicates` is the action for near-duplicates: skip, merge, flag or off.
+    """
+    detector = DuplicateDetector(duplicates)
+    report = {'inserted': 0, 'rejected': 0, 'errors': []}
+    rows = iter(rows)
+    line = 1  # the header
+
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+        documents: List[Dict] = []
+        lines: List[int] = []
+        for header, row in batch:
+            line += 1
+            fields, error = parse_row(header, row)
+            if error:
+                report['rejected'] += 1
+                if len(report['errors']) < MAX_REPORTED_ERRORS:
+                    report['errors'].append({'row': line, 'error': error})
+            elif fields:
+                documents.append(fields)
+                lines.append(line)
+        if documents:
+            report['inserted'] += detector.process(documents, lines)
+
+    report['duplicates'] = detector.report
+    return report
@@ -0,0 +1,134 @@
+import heapq
+import math
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+
+# BM25F-style field weights: a title hit counts more than a tag hit, which counts more than the description
+DEFAULT_FIELD_WEIGHTS = {'title': 3.0, 'tags': 2.0, 'description': 1.0}
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase and split text into search terms."""
+    return TOKEN_RE.findall(text.lower())
+
+
+def search_options(args, default_limit: int = DEFAULT_LIMIT):
+    """Read the shared `q`, `limit` and `explain` query parameters of the search routes."""
+    query = args.get('q', '')
+    try:
+        limit = int(args.get('limit', default_limit))
+    except (TypeError, ValueError):
+        limit = default_limit
+    limit = max(1, min(limit, MAX_LIMIT))
+    explain = args.get('explain', '').lower() in ('1', 'true', 'yes')
+    return query, limit, explain
+
+
+class SearchHit(NamedTuple):
+    doc_id: int
+    score: float
+    explanation: Optional[Dict[str, float]]
+
+
+class BM25Index:
+    """In-memory BM25 index over documents with weighted text fields.
+
+    Each document is a dict (or has a dict-like `get`); list-valued fields (e.g. tags) are joined
+    before tokenizing. Postings are built once, so a query only touches documents that share a term
+    with it.
+    """
+
+    def __init__(self, documents: Iterable[Dict], field_weights: Dict[str, float] = None,
+                 k1: float = 1.2, b: float = 0.75):
+        self.documents = list(documents)
+        self.field_weights = field_weights or DEFAULT_FIELD_WEIGHTS
+        self.k1 = k1
+        self.b = b
+
+        self.postings = defaultdict(list)  # term -> [(doc_id, weighted term frequency)]
+        lengths = []
+        for doc_id, doc in enumerate(self.documents):
+            frequencies = defaultdict(float)
+            length = 0.0
+            for field, weight in self.field_weights.items():
+                value = doc.get(field) or ''
+                if isinstance(value, (list, tuple)):
+                    value = ' '.join(value)
+                tokens = tokenize(value)
+                length += weight * len(tokens)
+                for token in tokens:
+                    frequencies[token] += weight
+            lengths.append(length)
+            for term, frequency in frequencies.items():
+                self.postings[term].append((doc_id, frequency))
+
+        count = len(self.documents)
+        average = (sum(lengths) / count) if count else 0.0
+        # Length normalisation only depends on the document, so it is folded in at build time
+        self.norms = [k1 * (1 - b + b * (length / average if average else 0.0)) for length in lengths]
+        self.idf = {
+            term: math.log(1 + (count - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, docs in self.postings.items()
+        }
+
+    def __len__(self):
+        return len(self.documents)
+
+    def _scores(self, query: str, explain: bool):
+        scores = defaultdict(float)
+        details = defaultdict(dict) if explain else None
+
+        for term in dict.fromkeys(tokenize(query)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for doc_id, frequency in self.postings[term]:
+                contribution = idf * frequency * (self.k1 + 1) / (frequency + self.norms[doc_id])
+                scores[doc_id] += contribution
+                if explain:
+                    details[doc_id][term] = round(contribution, 4)
+        return scores, details
+
+    def search_page(self, query: str, offset: int = 0, limit: int = DEFAULT_LIMIT,
+                    explain: bool = False) -> Tuple[List[SearchHit], int]:
+        """Hits `offset`..`offset + limit` for the query, best first, and the number of matching documents.
+
+        The heap only ever holds `offset + limit` entries, so the page, not the number of matches,
+        bounds what is sorted and returned.
+        """
+        scores, details = self._scores(query, explain)
+        # Ties keep catalog order
+        top = heapq.nlargest(offset + limit, scores.items(), key=lambda item: (item[1], -item[0]))[offset:]
+        hits = [
+            SearchHit(doc_id, score, details[doc_id] if explain else None)
+            for doc_id, score in top
+        ]
+        return hits, len(scores)
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT, explain: bool = False) -> List[SearchHit]:
+        """Return the top `limit` documents for the query, best first."""
+        return self.search_page(query, 0, limit, explain)[0]
+
+    def search_documents(self, query: str, limit: int = DEFAULT_LIMIT, explain: bool = False) -> List[Dict]:
+        """Like `search`, but returns copies of the matching documents annotated with their score."""
+        return self.search_documents_page(query, 0, limit, explain)[0]
+
+    def search_documents_page(self, query: str, offset: int = 0, limit: int = DEFAULT_LIMIT,
+                              explain: bool = False) -> Tuple[List[Dict], int]:
+        """`search_page` returning annotated document copies, as `search_documents` does."""
+        hits, total = self.search_page(query, offset, limit, explain)
+        results = []
+        for hit in hits:
+            source = self.documents[hit.doc_id]
+            doc = source.to_dict() if hasattr(source, 'to_dict') else dict(source)
+            doc['score'] = round(hit.score, 4)
+            if explain:
+                doc['explanation'] = hit.explanation
+            results.append(doc)
+        return results, total
@@ -0,0 +1,228 @@
+import json
+import os
+import re
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from pymongo import ASCENDING, DESCENDING, UpdateOne, DeleteMany
+from pymongo.errors import BulkWriteError
+
+from app.models.recommendation import Recommendation
+from app.utils.metrics import metrics
+
+TTL_DAYS = int(os.getenv('RECOMMENDATION_TTL_DAYS', 30))  # search results not refreshed within this expire
+CATALOG_SOURCE = 'catalog'  # batch matches are replaced by the batch job and never expire
+COMPACT_BATCH_SIZE = 1000
+COMPACT_PAUSE_SECONDS = 0.1  # sleep between compaction writes so live traffic keeps the disk
+
+TRACKING_PARAMS = re.compile(r'^(utm_\w+|gclid|fbclid|msclkid|ref|ref_src)$', re.IGNORECASE)
+_indexed = False
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a result URL: https, lower-case host without `www.`, no fragment or tracking
+    parameters, sorted query and no trailing slash, so the same page found twice gets one key."""
+    url = (url or '').strip()
+    if not url:
+        return ''
+    parts = urlsplit(url if '://' in url else f'https://{url}')
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port and port not in (80, 443):
+        host = f'{host}:{port}'
+    scheme = 'https' if parts.scheme.lower() in ('http', 'https') else parts.scheme.lower()
+    path = re.sub(r'/{2,}', '/', parts.path).rstrip('/')
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not TRACKING_PARAMS.match(key)
+    ))
+    return urlunsplit((scheme, host, path, query, ''))
+
+
+def tag_list(value) -> List[str]:
+    """Tags as a list; documents written before the array migration hold a JSON string."""
+    if isinstance(value, list):
+        return value
+    if not value:
+        return []
+    try:
+        decoded = json.loads(value)
+    except ValueError:
+        return value.split()
+    return [str(tag) for tag in decoded] if isinstance(decoded, list) else [str(decoded)]
+
+
+def recommendation_collection():
+    """The raw `recommendation` collection shared by app.py's and app.models' Recommendation.
+
+    One document per (user, category, url_key); the index is partial so documents written before
+    url_key existed do not block it until `compact` has deduplicated and backfilled them.
+    """
+    global _indexed
+    collection = Recommendation._get_collection()
+    if not _indexed:
+        collection.create_index(
+            [('user', ASCENDING), ('category', ASCENDING), ('url_key', ASCENDING)],
+            unique=True, partialFilterExpression={'url_key': {'$exists': True}}
+        )
+        collection.create_index([('user', ASCENDING), ('category', ASCENDING), ('created_at', DESCENDING)])
+        collection.create_index('expires_at', expireAfterSeconds=0)
+        collection.create_index('tags')  # multikey once tags are arrays
+        _indexed = True
+    return collection
+
+
+def recommendation_upsert(document: Dict, now: datetime = None) -> UpdateOne:
+    """Upsert keyed on (user, category, normalized URL): storing a URL again refreshes it instead of
+    adding a copy. Search results get a fresh `expires_at`; catalog matches never expire."""
+    now = now or datetime.utcnow()
+    key = {'user': document['user'], 'category': document['category'], 'url_key': normalize_url(document['url'])}
+    fields = {name: value for name, value in document.items() if name != 'created_at'}
+    update = {
+        '$set': {**fields, 'url_key': key['url_key'], 'updated_at': now},
+        '$setOnInsert': {'created_at': document.get('created_at', now)}
+    }
+    if document.get('source') == CATALOG_SOURCE:
+        update['$unset'] = {'expires_at': ''}
+    else:
+        update['$set']['expires_at'] = now + timedelta(days=TTL_DAYS)
+    return UpdateOne(key, update, upsert=True)
+
+
+def only_duplicate_keys(error: BulkWriteError) -> bool:
+    """A concurrent upsert of the same URL already stored it; nothing is lost."""
+    return all(failure.get('code') == 11000 for failure in error.details.get('writeErrors', []))
+
+
+def store_documents(documents: Iterable[Dict]) -> int:
+    """Upsert recommendation documents (each with user, category and url); returns how many were written."""
+    now = datetime.utcnow()
+    writes = [recommendation_upsert(document, now) for document in documents if document.get('url')]
+    if not writes:
+        return 0
+    try:
+        recommendation_collection().bulk_write(writes, ordered=False)
+    except BulkWriteError as e:
+        if not only_duplicate_keys(e):
+            print(f"Error saving recommendations: {str(e)}")
+    metrics.inc('recommendations_upserted_total', len(writes))
+    return len(writes)
+
+
+def collection_size(collection) -> Dict:
+    stats = collection.database.command('collStats', collection.name)
+    return {
+        'documents': stats.get('count', 0),
+        'data_bytes': stats.get('size', 0),
+        'storage_bytes': stats.get('storageSize', 0),
+        'index_bytes': stats.get('totalIndexSize', 0)
+    }
+
+
+def compact(batch_size: int = COMPACT_BATCH_SIZE, pause: float = COMPACT_PAUSE_SECONDS,
+            dry_run: bool = False, reclaim_storage: bool = False) -> Dict:
+    """Remove duplicate URLs per (user, category), keeping the newest, and backfill url_key/expires_at.
+
+    The collection is walked in (user, category) order so only one group is held in memory; deletes
+    and backfills are written `batch_size` at a time with `pause` seconds between writes. With
+    `reclaim_storage` the server's `compact` command then returns the freed pages to the OS.
+    """
+    started = time.perf_counter()
+    collection = recommendation_collection()
+    before = collection_size(collection)
+    now = datetime.utcnow()
+    report = {'scanned': 0, 'duplicates_removed': 0, 'backfilled': 0}
+    backfills: List = []
+    duplicates: List = []
+
+    def flush(force=False):
+        nonlocal backfills, duplicates
+        if not (duplicates or backfills) or not (force or len(duplicates) + len(backfills) >= batch_size):
+            return
+        # Deletes go first so no backfilled url_key collides with a copy that is about to be removed
+        writes = ([DeleteMany({'_id': {'$in': duplicates}})] if duplicates else []) + backfills
+        if not dry_run:
+            collection.bulk_write(writes, ordered=True)
+            time.sleep(pause)
+        report['duplicates_removed'] += len(duplicates)
+        backfills, duplicates = [], []
+
+    def close_group(group):
+        # Newest first: the first document per URL is kept
+        kept = {}
+        for document in sorted(group, key=lambda d: d.get('created_at') or datetime.min, reverse=True):
+            url_key = normalize_url(document.get('url'))
+            if url_key in kept:
+                duplicates.append(document['_id'])
+                continue
+            kept[url_key] = document
+            backfill = {}
+            if document.get('url_key') != url_key:
+                backfill['url_key'] = url_key
+            if document.get('source') != CATALOG_SOURCE and 'expires_at' not in document:
+                backfill['expires_at'] = (document.get('created_at') or now) + timedelta(days=TTL_DAYS)
+            if backfill:
+                backfills.append(UpdateOne({'_id': document['_id']}, {'$set': backfill}))
+                report['backfilled'] += 1
+
+    fields = {'user': 1, 'category': 1, 'url': 1, 'url_key': 1, 'source': 1, 'created_at': 1, 'expires_at': 1}
+    cursor = collection.find({}, fields).sort([('user', ASCENDING), ('category', ASCENDING)]).batch_size(batch_size)
+    group, group_key = [], None
+    for document in cursor:
+        report['scanned'] += 1
+        key = (document.get('user'), document.get('category'))
+        if key != group_key and group:
+            close_group(group)
+            flush()
+            group = []
+        group_key = key
+        group.append(document)
+    if group:
+        close_group(group)
+    flush(force=True)
+
+    if reclaim_storage and not dry_run:
+        collection.database.command('compact', collection.name)
+    after = before if dry_run else collection_size(collection)
+    report.update({
+        'dry_run': dry_run,
+        'before': before,
+        'after': after,
+        'reclaimed_data_bytes': before['data_bytes'] - after['data_bytes'],
+        'reclaimed_storage_bytes': before['storage_bytes'] - after['storage_bytes'],
+        'seconds': round(time.perf_counter() - started, 2)
+    })
+    metrics.inc('recommendation_duplicates_removed_total', 0 if dry_run else report['duplicates_removed'])
+    metrics.set('recommendation_collection_bytes', after['data_bytes'])
+    print(f"[✓] Recommendation compaction: {report['duplicates_removed']} duplicates removed, "
+          f"{report['reclaimed_data_bytes']} bytes reclaimed")
+    return report
+
+
+if __name__ == '__main__':
+    import argparse
+    import json
+    from app.utils.db import connect_db
+
+    parser = argparse.ArgumentParser(description='Deduplicate and compact stored recommendations')
+    parser.add_argument('command', choices=('compact', 'enqueue'),
+                        help="compact now, or queue a compaction for the job workers")
+    parser.add_argument('--batch-size', type=int, default=COMPACT_BATCH_SIZE)
+    parser.add_argument('--pause', type=float, default=COMPACT_PAUSE_SECONDS, help="Seconds to sleep between writes")
+    parser.add_argument('--dry-run', action='store_true')
+    parser.add_argument('--reclaim-storage', action='store_true', help="Run the server compact command afterwards")
+    args = parser.parse_args()
+
+    connect_db()
+    if args.command == 'enqueue':
+        from app.services.jobs import enqueue_recommendation_compaction
+        print(json.dumps({'enqueued': enqueue_recommendation_compaction(args.batch_size, args.pause)}))
+    else:
+        print(json.dumps(compact(args.batch_size, args.pause, args.dry_run, args.reclaim_storage), default=str))
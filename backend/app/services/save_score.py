@@ -1,8 +1,12 @@
 from app.models.score import Score
 from app.utils.db import connect_db
+from app.services.score_history import record_scores
+from app.services.jobs import enqueue_recommendation_recompute
 
 def save_score(user_id, domain, scores):
     connect_db()
     score = Score(user_id=user_id, domain=domain, skill_scores=scores)
     score.save()
+    record_scores([(user_id, domain, scores, score.submitted_at)])
+    enqueue_recommendation_recompute(user_id)
     return {"message": "Score saved successfully"}
@@ -0,0 +1,180 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pymongo import ASCENDING, UpdateOne
+
+from app.models.score import Score
+
+PERIODS = ('day', 'week')
+MAX_DAY_POINTS = 200  # raw submissions kept inside each day bucket
+MAX_RANGE_DAYS = 3 * 366
+# app.py's submit_answers rolls its percentage up under this domain; the raw rows it writes do not
+# keep the answer count, so these rollups cannot be replayed and `rebuild` carries them over as is
+ASSESSMENT_DOMAIN = 'assessment'
+REBUILD_COLLECTION = 'score_rollups_rebuild'
+_indexed = False
+
+
+def rollup_collection():
+    """Pre-aggregated buckets, one document per user, domain, period and period start.
+
+    {user_id, domain, period, start, count, sum, min, max, last_at, skills: {name: {sum, count}}, points?}
+    Day buckets also keep the raw (t, total) points of that day.
+    """
+    global _indexed
+    collection = Score._get_collection().database['score_rollups']
+    if not _indexed:
+        create_rollup_indexes(collection)
+        _indexed = True
+    return collection
+
+
+def create_rollup_indexes(collection):
+    collection.create_index([('user_id', ASCENDING), ('period', ASCENDING), ('start', ASCENDING)])
+
+
+def period_start(moment: datetime, period: str) -> datetime:
+    day = datetime(moment.year, moment.month, moment.day)
+    return day - timedelta(days=day.weekday()) if period == 'week' else day
+
+
+def overall(skill_scores: Dict) -> Optional[float]:
+    values = [float(v) for v in (skill_scores or {}).values() if isinstance(v, (int, float))]
+    return round(sum(values) / len(values), 2) if values else None
+
+
+def skill_key(name: str) -> str:
+    # Field names inside the rollup may not contain '.' or start with '$'
+    return str(name).replace('.', '_').lstrip('$') or '_'
+
+
+def rollup_writes(user_id: str, domain: str, skill_scores: Dict, submitted_at: datetime,
+                  total: Optional[float] = None) -> List[UpdateOne]:
+    """Upserts that fold one submission into its day and week buckets."""
+    total = overall(skill_scores) if total is None else total
+    if total is None:
+        return []
+    writes = []
+    for period in PERIODS:
+        start = period_start(submitted_at, period)
+        inc = {'count': 1, 'sum': total}
+        for name, value in (skill_scores or {}).items():
+            if isinstance(value, (int, float)):
+                key = skill_key(name)
+                inc[f'skills.{key}.sum'] = float(value)
+                inc[f'skills.{key}.count'] = 1
+        update = {
+            '$setOnInsert': {'user_id': user_id, 'domain': domain, 'period': period, 'start': start},
+            '$inc': inc,
+            '$min': {'min': total},
+            '$max': {'max': total, 'last_at': submitted_at}
+        }
+        if period == 'day':
+            update['$push'] = {'points': {'$each': [{'t': submitted_at, 'total': total}], '$slice': -MAX_DAY_POINTS}}
+        writes.append(UpdateOne(
+            {'_id': f"{user_id}|{domain}|{period}|{start:%Y-%m-%d}"}, update, upsert=True
+        ))
+    return writes
+
+
+def record_scores(entries: Iterable[Tuple]) -> int:
+    """Fold (user_id, domain, skill_scores, submitted_at[, total]) submissions into the rollups."""
+    writes = [write for entry in entries for write in rollup_writes(*entry)]
+    if not writes:
+        return 0
+    try:
+        rollup_collection().bulk_write(writes, ordered=False)
+    except Exception as e:
+        # The raw score is already stored; a missed rollup is repaired by `rebuild`
+        print(f"Error updating score rollups: {str(e)}")
+        return 0
+    return len(writes)
+
+
+def score_history(user_id: str, period: str = 'day', start: datetime = None, end: datetime = None,
+                  domain: str = None) -> Dict[str, List[Dict]]:
+    """Chart points per domain for [start, end): one rollup document per point, oldest first."""
+    if period not in PERIODS:
+        raise ValueError(f"period must be one of {', '.join(PERIODS)}")
+    end = end or datetime.utcnow() + timedelta(days=1)
+    start = start or end - timedelta(days=365)
+    if start >= end or (end - start).days > MAX_RANGE_DAYS:
+        raise ValueError(f"Range must be positive and at most {MAX_RANGE_DAYS} days")
+
+    query = {'user_id': user_id, 'period': period, 'start': {'$gte': period_start(start, period), '$lt': end}}
+    if domain:
+        query['domain'] = domain
+
+    series = {}
+    for bucket in rollup_collection().find(query, {'points': 0}).sort('start', ASCENDING):
+        series.setdefault(bucket['domain'], []).append({
+            'start': bucket['start'].strftime('%Y-%m-%d'),
+            'count': bucket['count'],
+            'average': round(bucket['sum'] / bucket['count'], 2),
+            'min': bucket['min'],
+            'max': bucket['max'],
+            'skills': {
+                name: round(values['sum'] / values['count'], 2)
+                for name, values in bucket.get('skills', {}).items() if values.get('count')
+            }
+        })
+    return series
+
+
+def replay(collection, query: Dict, batch_size: int) -> int:
+    """Fold the raw `scores` matching `query` into `collection`; returns how many were replayed."""
+    fields = {'user_id': 1, 'domain': 1, 'skill_scores': 1, 'submitted_at': 1}
+    query = {**query, 'domain': {'$ne': ASSESSMENT_DOMAIN}}
+    pending, replayed = [], 0
+    for score in Score._get_collection().find(query, fields).batch_size(batch_size):
+        pending.extend(rollup_writes(
+            score['user_id'], score['domain'], score.get('skill_scores'), score.get('submitted_at') or datetime.utcnow()
+        ))
+        replayed += 1
+        if len(pending) >= batch_size:
+            collection.bulk_write(pending, ordered=False)
+            pending = []
+    if pending:
+        collection.bulk_write(pending, ordered=False)
+    return replayed
+
+
+def rebuild(batch_size: int = 1000) -> int:
+    """Recompute the rollups from the raw `scores` collection without emptying the live ones.
+
+    The rollups are built in a separate collection, assessment rollups are copied into it, and it
+    then replaces the live collection with one rename. Scores submitted while it was being built
+    are replayed into it after the swap; a score recorded in the instant of the rename itself may
+    still be folded in twice, so run this when submissions are quiet.
+    """
+    live = rollup_collection()
+    building = live.database[REBUILD_COLLECTION]
+    building.drop()
+    create_rollup_indexes(building)
+
+    started = datetime.utcnow()
+    replayed = replay(building, {'submitted_at': {'$not': {'$gte': started}}}, batch_size)
+    batch = []
+    for bucket in live.find({'domain': ASSESSMENT_DOMAIN}).batch_size(batch_size):
+        batch.append(bucket)
+        if len(batch) >= batch_size:
+            building.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        building.insert_many(batch, ordered=False)
+
+    swapped = datetime.utcnow()
+    building.rename(live.name, dropTarget=True)
+    return replayed + replay(live, {'submitted_at': {'$gte': started, '$lt': swapped}}, batch_size)
+
+
+if __name__ == '__main__':
+    import argparse
+    from app.utils.db import connect_db
+
+    parser = argparse.ArgumentParser(description='Maintain score history rollups')
+    parser.add_argument('command', choices=('rebuild',))
+    args = parser.parse_args()
+
+    connect_db()
+    print(f"[✓] Rolled up {rebuild()} scores")
@@ -1,32 +1,65 @@
 import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.neighbors import NearestNeighbors
-from typing import List
+from typing import Dict, List, Tuple
 import requests
 import os
 from app.config import Config
+from app.services.ranking import BM25Index, DEFAULT_LIMIT
+
+QUESTIONS_CSV = os.getenv(
+    'QUESTIONS_CSV',
+    os.path.join(os.path.dirname(__file__), '..', '..', '..', 'database', 'examplee.csv')
+)
+
 
 class QuestionSearch:
     def __init__(self):
-        self.questions = self._load_questions()
-        self.vectorizer = TfidfVectorizer()
-        self.question_vectors = self.vectorizer.fit_transform(self.questions)
-        self.neighbors = NearestNeighbors(n_neighbors=20, metric='cosine')
-        self.neighbors.fit(self.question_vectors)
-    
-    def _load_questions(self) -> List[str]:
+        self.rows = self._load_questions()
+        self.questions = [row['question'] for row in self.rows]
+        # Mapped onto the default field weights: question text ranks above its
+        # domain/difficulty/badge labels, which rank above the options
+        self.index = BM25Index(
+            [
+                {
+                    'title': row['question'],
+                    'tags': [row.get('Domain', ''), row.get('difficulty_level', ''), row.get('Badge', '')],
+                    'description': ' '.join(row.get(f'Option {letter}', '') for letter in 'ABCD')
+                } for row in self.rows
+            ]
+        )
+
+    def _load_questions(self) -> List[Dict[str, str]]:
         try:
-            data = pd.read_csv("database/examplee.csv", encoding="utf-8-sig")
-            return data['question'].tolist()
+            data = pd.read_csv(QUESTIONS_CSV, encoding="utf-8-sig", dtype=str)
         except UnicodeDecodeError:
-            data = pd.read_csv("database/examplee.csv", encoding="ISO-8859-1")
-            return data['question'].tolist()
+            data = pd.read_csv(QUESTIONS_CSV, encoding="ISO-8859-1", dtype=str)
         except Exception as e:
             print(f"Error loading questions: {e}")
             return []
-    
-    def search(self, query: str) -> List[str]:
-        query_vector = self.vectorizer.transform([query])
-        distances, indices = self.neighbors.kneighbors(query_vector)
-        return [self.questions[i] for i in indices[0]]
+        return data.fillna('').to_dict('records')
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT) -> List[str]:
+        return [self.questions[hit.doc_id] for hit in self.index.search(query, limit)]
+
+    def search_page(self, query: str, offset: int = 0, limit: int = DEFAULT_LIMIT) -> Tuple[List[str], int]:
+        hits, total = self.index.search_page(query, offset, limit)
+        return [self.questions[hit.doc_id] for hit in hits], total
+
+    def search_scored(self, query: str, limit: int = DEFAULT_LIMIT, explain: bool = False) -> List[Dict]:
+        return self.search_scored_page(query, 0, limit, explain)[0]
 
+    def search_scored_page(self, query: str, offset: int = 0, limit: int = DEFAULT_LIMIT,
+                           explain: bool = False) -> Tuple[List[Dict], int]:
+        hits, total = self.index.search_page(query, offset, limit, explain)
+        results = []
+        for hit in hits:
+            row = self.rows[hit.doc_id]
+            result = {
+                'question': row['question'],
+                'domain': row.get('Domain', ''),
+                'difficulty': row.get('difficulty_level', ''),
+                'score': round(hit.score, 4)
+            }
+            if explain:
+                result['explanation'] = hit.explanation
+            results.append(result)
+        return results, total
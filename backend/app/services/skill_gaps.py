@@ -0,0 +1,158 @@
+import heapq
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+from app.models.question import Question
+from app.models.score import Score
+from app.utils.catalog import catalog_store
+
+# Catalog kind -> category name used in recommendation responses
+CATALOG_CATEGORIES = {'courses': 'courses', 'experiences': 'projects', 'internships': 'internships'}
+
+WEAK_THRESHOLD = 70.0  # skills averaging below this are remediation targets
+MAX_WEAK_SKILLS = 3
+RECENT_SCORES = 10  # submissions averaged per user
+ITEMS_PER_SKILL = 10
+QUESTIONS_PER_SKILL = 10
+QUESTION_REFRESH_SECONDS = 600
+TAG_WEIGHT = 1.0  # the whole tag equals the skill
+WORD_WEIGHT = 0.5  # the skill is one word of a tag or title
+
+# Easier questions first: a weak skill is remediated from the bottom up
+BADGE_ORDER = {'bronze': 0, 'silver': 1, 'gold': 2}
+LEVEL_ORDER = {'beginner': 0, 'easy': 0, 'intermediate': 1, 'medium': 1, 'advanced': 2, 'hard': 2}
+
+SKILL_RE = re.compile(r"[^a-z0-9+#]+")
+
+
+def skill_key(name) -> str:
+    return SKILL_RE.sub(' ', str(name or '').lower()).strip()
+
+
+class SkillIndex:
+    """skill -> ranked catalog items and questions, computed once so a lookup is a dict access.
+
+    Catalog items are keyed by each tag and by every word of their tags and title; questions are
+    keyed by their domain and ordered easiest first (badge, then difficulty). Only the best
+    ITEMS_PER_SKILL / QUESTIONS_PER_SKILL entries per skill are kept.
+    """
+
+    def __init__(self, snapshot, questions):
+        self.version = snapshot.version
+        self.items: Dict[str, Dict[str, List[Dict]]] = {}
+        self.questions: Dict[str, List[Dict]] = questions
+
+        weighted = defaultdict(lambda: defaultdict(dict))  # skill -> category -> url -> (weight, item)
+        for kind, category in CATALOG_CATEGORIES.items():
+            for item in snapshot.items.get(kind, ()):
+                weights = {}
+                for tag in item.tags:
+                    for word in skill_key(tag).split():
+                        weights.setdefault(word, WORD_WEIGHT)
+                for word in skill_key(item.title).split():
+                    weights.setdefault(word, WORD_WEIGHT)
+                for tag in item.tags:
+                    weights[skill_key(tag)] = TAG_WEIGHT
+                for skill, weight in weights.items():
+                    current = weighted[skill][category].get(item.url)
+                    if current is None or current[0] < weight:
+                        weighted[skill][category][item.url] = (weight, item)
+
+        for skill, categories in weighted.items():
+            self.items[skill] = {
+                category: [
+                    {**item.to_dict(), 'weight': weight}
+                    for weight, item in sorted(entries.values(), key=lambda entry: -entry[0])[:ITEMS_PER_SKILL]
+                ]
+                for category, entries in categories.items()
+            }
+
+    def lookup(self, skill: str) -> Dict:
+        key = skill_key(skill)
+        found = {category: list(entries) for category, entries in self.items.get(key, {}).items()}
+        found['questions'] = list(self.questions.get(key, ()))
+        return found
+
+
+def load_domain_questions() -> Dict[str, List[Dict]]:
+    """The QUESTIONS_PER_SKILL easiest questions per domain, streamed so memory stays bounded."""
+    heaps = defaultdict(list)
+    fields = {'domain': 1, 'question': 1, 'badge': 1, 'difficulty_level': 1}
+    for order, doc in enumerate(Question._get_collection().find({}, fields).batch_size(2000)):
+        # Negated (badge, level, order): the heap root is the hardest question kept so far
+        key = (
+            -BADGE_ORDER.get(skill_key(doc.get('badge')), len(BADGE_ORDER)),
+            -LEVEL_ORDER.get(skill_key(doc.get('difficulty_level')), len(LEVEL_ORDER)),
+            -order
+        )
+        heap = heaps[skill_key(doc.get('domain'))]
+        if len(heap) == QUESTIONS_PER_SKILL and key <= heap[0][0]:
+            continue
+        entry = (key, {
+            'id': str(doc['_id']),
+            'question': doc.get('question'),
+            'difficulty': doc.get('difficulty_level'),
+            'badge': doc.get('badge')
+        })
+        if len(heap) < QUESTIONS_PER_SKILL:
+            heapq.heappush(heap, entry)
+        else:
+            heapq.heapreplace(heap, entry)
+    return {
+        skill: [question for _, question in sorted(heap, key=lambda entry: entry[0], reverse=True)]
+        for skill, heap in heaps.items()
+    }
+
+
+class SkillGapRecommender:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._index = None
+        self._questions = None
+        self._questions_at = 0.0
+
+    def index(self) -> SkillIndex:
+        """The skill index for the current catalog snapshot; questions are reloaded every QUESTION_REFRESH_SECONDS."""
+        snapshot = catalog_store.current()
+        stale_questions = time.monotonic() - self._questions_at > QUESTION_REFRESH_SECONDS
+        if self._index is not None and self._index.version == snapshot.version and not stale_questions:
+            return self._index
+        with self._lock:
+            if self._questions is None or time.monotonic() - self._questions_at > QUESTION_REFRESH_SECONDS:
+                self._questions = load_domain_questions()
+                self._questions_at = time.monotonic()
+            if self._index is None or self._index.version != snapshot.version or stale_questions:
+                self._index = SkillIndex(snapshot, self._questions)
+            return self._index
+
+    def weak_skills(self, user_id: str) -> List[Dict]:
+        """Skills averaging below WEAK_THRESHOLD over the user's most recent submissions, weakest first."""
+        totals = defaultdict(lambda: [0.0, 0])
+        recent = Score._get_collection().find(
+            {'user_id': user_id}, {'skill_scores': 1}
+        ).sort('submitted_at', -1).limit(RECENT_SCORES)
+        for score in recent:
+            for skill, value in (score.get('skill_scores') or {}).items():
+                if isinstance(value, (int, float)):
+                    totals[skill][0] += value
+                    totals[skill][1] += 1
+        averages = sorted((total / count, skill) for skill, (total, count) in totals.items())
+        return [
+            {'skill': skill, 'score': round(average, 2)}
+            for average, skill in averages if average < WEAK_THRESHOLD
+        ][:MAX_WEAK_SKILLS]
+
+    def recommend(self, user_id: str) -> List[Dict]:
+        """Remediation items for each weak skill, ranked by how closely they match it."""
+        index = self.index()
+        results = []
+        for weak in self.weak_skills(user_id):
+            gap = round((100.0 - weak['score']) / 100.0, 4)
+            results.append({**weak, 'gap': gap, **index.lookup(weak['skill'])})
+        return results
+
+
+skill_gap_recommender = SkillGapRecommender()
@@ -0,0 +1,149 @@
+import heapq
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from app.services.ranking import tokenize
+from app.utils.catalog import catalog_store
+
+CATALOG_KINDS = (('courses', 'course'), ('experiences', 'experience'), ('internships', 'internship'))
+PRECOMPUTED_PREFIX_LENGTH = 2   # prefixes this short have their top suggestions computed at build time
+PRECOMPUTED_TOP = 20
+MAX_SCAN = 5000                 # longer prefixes scan at most this many keys of their range
+REBUILD_SECONDS = 60
+MAX_POPULARITY_KEYS = 100000    # hits are only counted for existing suggestions, and at most this many
+
+
+class SuggestIndex:
+    """Sorted array of lowercase keys for prefix lookups with `bisect`.
+
+    Every word position of a suggestion is a key ("machine learning" is found by "mach" and "lear"),
+    so each key maps back to the suggestion it came from. Scores are fixed at build time; popularity
+    counted since then is folded in on the next rebuild.
+    """
+
+    def __init__(self, entries: List[Tuple[str, str]], popularity: Counter):
+        self.texts, self.kinds, self.scores = [], [], []
+        seen = {}
+        for text, kind in entries:
+            key = (text.lower(), kind)
+            if key in seen or not text:
+                continue
+            seen[key] = len(self.texts)
+            self.texts.append(text)
+            self.kinds.append(kind)
+            self.scores.append(popularity[text.lower()])
+        self.known = {text.lower() for text in self.texts}
+
+        pairs = []
+        for entry_id, text in enumerate(self.texts):
+            lowered = text.lower()
+            starts = {0}
+            for token in tokenize(lowered):
+                starts.add(lowered.find(token))
+            pairs.extend((lowered[start:], entry_id) for start in starts if start >= 0)
+        pairs.sort()
+        self.keys = [key for key, _ in pairs]
+        self.entry_ids = [entry_id for _, entry_id in pairs]
+
+        self.top = {}
+        for key, entry_id in pairs:
+            for length in range(1, PRECOMPUTED_PREFIX_LENGTH + 1):
+                if len(key) >= length:
+                    self.top.setdefault(key[:length], set()).add(entry_id)
+        self.top = {prefix: self._rank(ids, PRECOMPUTED_TOP) for prefix, ids in self.top.items()}
+
+    def _rank(self, entry_ids, limit: int) -> List[int]:
+        return heapq.nlargest(limit, entry_ids, key=lambda i: (self.scores[i], -len(self.texts[i]), -i))
+
+    def lookup(self, prefix: str, limit: int) -> List[Dict]:
+        prefix = prefix.lower().lstrip()
+        if not prefix:
+            return []
+        if len(prefix) <= PRECOMPUTED_PREFIX_LENGTH and limit <= PRECOMPUTED_TOP:
+            ranked = self.top.get(prefix, [])[:limit]
+        else:
+            found = set()
+            position = bisect_left(self.keys, prefix)
+            end = min(len(self.keys), position + MAX_SCAN)
+            while position < end and self.keys[position].startswith(prefix):
+                found.add(self.entry_ids[position])
+                position += 1
+            ranked = self._rank(found, limit)
+        return [{'text': self.texts[i], 'kind': self.kinds[i]} for i in ranked]
+
+
+class Suggester:
+    """Owns the current SuggestIndex, the live popularity counters and background rebuilds."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.popularity = Counter()
+        self.entries = None
+        self.catalog_version = None
+        self.index = None
+        self.built_at = 0.0
+        self.dirty = False
+        self.rebuilding = False
+
+    def _load_entries(self) -> List[Tuple[str, str]]:
+        snapshot = catalog_store.current()
+        self.catalog_version = snapshot.version
+        entries = []
+        for catalog, kind in CATALOG_KINDS:
+            for item in snapshot.items[catalog]:
+                entries.append((item.title, kind))
+                entries.extend((tag, 'tag') for tag in item.tags)
+        try:
+            from app.models.question import Question
+            entries.extend((q.question, 'question') for q in Question.objects.only('question'))
+        except Exception as e:
+            print(f"Error loading questions for suggestions: {e}")
+        return entries
+
+    def build(self, reload: bool = False) -> SuggestIndex:
+        """Rebuild the index; `reload` re-reads the catalogs and questions (e.g. after an upload)."""
+        if reload or self.entries is None:
+            self.entries = self._load_entries()
+        with self._lock:
+            popularity = Counter(self.popularity)
+            self.dirty = False
+        # Tags shared by many catalog items start out more popular than one-off titles
+        popularity.update(text.lower() for text, kind in self.entries if kind == 'tag')
+        index = SuggestIndex(self.entries, popularity)
+        self.index = index
+        self.built_at = time.monotonic()
+        self.rebuilding = False
+        return index
+
+    def suggest(self, prefix: str, limit: int) -> List[Dict]:
+        index = self.index
+        if index is None:
+            index = self.build()
+        elif not self.rebuilding and catalog_store.current().version != self.catalog_version:
+            # A catalog file changed: reload the entries off the request path
+            self.rebuilding = True
+            threading.Thread(target=self.build, kwargs={'reload': True}, daemon=True).start()
+        elif self.dirty and not self.rebuilding and time.monotonic() - self.built_at > REBUILD_SECONDS:
+            # Fold new popularity in off the request path; keep serving the current index meanwhile
+            self.rebuilding = True
+            threading.Thread(target=self.build, daemon=True).start()
+        return index.lookup(prefix, limit)
+
+    def record_hit(self, text: str) -> bool:
+        """Count a picked suggestion; False (and nothing stored) for text that is not a suggestion."""
+        key = text.lower()
+        index = self.index or self.build()
+        if key not in index.known:
+            return False
+        with self._lock:
+            if key not in self.popularity and len(self.popularity) >= MAX_POPULARITY_KEYS:
+                return False
+            self.popularity[key] += 1
+            self.dirty = True
+        return True
+
+
+suggester = Suggester()
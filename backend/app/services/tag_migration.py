@@ -0,0 +1,98 @@
+"""Online migration of recommendation tags from JSON strings to native arrays.
+
+    python -m app.services.tag_migration run --batch-size 500 --pause 0.2
+    python -m app.services.tag_migration status
+
+Documents are visited in `_id` order and rewritten `batch_size` at a time. After every batch the
+last `_id` is saved in the `migrations` collection, so an interrupted run resumes where it stopped.
+Each rewrite only applies if the document still holds the string that was read, so documents a
+request rewrote in the meantime are left alone. Reads accept both formats (`tag_list`) until
+the migration is done.
+"""
+import time
+from datetime import datetime
+from typing import Dict
+
+from pymongo import ASCENDING, UpdateOne
+
+from app.services.recommendation_store import recommendation_collection, tag_list
+
+MIGRATION_ID = 'recommendation_tags_array'
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_PAUSE_SECONDS = 0.2
+# `$type: 'string'` alone also matches arrays with string elements, i.e. every migrated document
+LEGACY_TAGS = {'$type': 'string', '$not': {'$type': 'array'}}
+
+
+def checkpoints():
+    return recommendation_collection().database['migrations']
+
+
+def load_checkpoint() -> Dict:
+    return checkpoints().find_one({'_id': MIGRATION_ID}) or {
+        '_id': MIGRATION_ID, 'last_id': None, 'scanned': 0, 'migrated': 0, 'done': False
+    }
+
+
+def save_checkpoint(checkpoint: Dict):
+    checkpoint['updated_at'] = datetime.utcnow()
+    checkpoints().replace_one({'_id': MIGRATION_ID}, checkpoint, upsert=True)
+
+
+def run(batch_size: int = DEFAULT_BATCH_SIZE, pause: float = DEFAULT_PAUSE_SECONDS,
+        max_batches: int = None) -> Dict:
+    """Migrate from the saved checkpoint; stops after `max_batches` batches (all when None)."""
+    collection = recommendation_collection()
+    checkpoint = load_checkpoint()
+    batches = 0
+    while not checkpoint['done'] and (max_batches is None or batches < max_batches):
+        # Walks the _id index; only documents whose tags are still a plain string are returned
+        query = {'tags': LEGACY_TAGS}
+        if checkpoint['last_id'] is not None:
+            query['_id'] = {'$gt': checkpoint['last_id']}
+        batch = list(collection.find(query, {'tags': 1}).sort('_id', ASCENDING).limit(batch_size))
+        if not batch:
+            checkpoint['done'] = True
+            save_checkpoint(checkpoint)
+            break
+
+        writes = [
+            UpdateOne({'_id': doc['_id'], 'tags': doc['tags']}, {'$set': {'tags': tag_list(doc['tags'])}})
+            for doc in batch if isinstance(doc.get('tags'), str)
+        ]
+        if writes:
+            checkpoint['migrated'] += collection.bulk_write(writes, ordered=False).modified_count
+        checkpoint['scanned'] += len(batch)
+        checkpoint['last_id'] = batch[-1]['_id']
+        save_checkpoint(checkpoint)
+        batches += 1
+        if writes:
+            time.sleep(pause)
+    return checkpoint
+
+
+def remaining() -> int:
+    """String-tagged documents left; reads are only free of decoding once this is 0."""
+    return recommendation_collection().count_documents({'tags': LEGACY_TAGS})
+
+
+if __name__ == '__main__':
+    import argparse
+    import json
+    from app.utils.db import connect_db
+
+    parser = argparse.ArgumentParser(description='Migrate recommendation tags to native arrays')
+    parser.add_argument('command', choices=('run', 'status', 'reset'))
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--pause', type=float, default=DEFAULT_PAUSE_SECONDS, help="Seconds to sleep between batches")
+    parser.add_argument('--max-batches', type=int, help="Stop after this many batches; run again to continue")
+    args = parser.parse_args()
+
+    connect_db()
+    if args.command == 'reset':
+        checkpoints().delete_one({'_id': MIGRATION_ID})
+        print("[✓] Checkpoint cleared; the next run starts from the first document")
+    else:
+        if args.command == 'run':
+            run(args.batch_size, args.pause, args.max_batches)
+        print(json.dumps({**load_checkpoint(), 'remaining': remaining()}, default=str))
@@ -0,0 +1,142 @@
+import heapq
+import threading
+import time
+from array import array
+from collections import defaultdict
+from typing import List, Optional, Tuple
+
+REFRESH_SECONDS = 30       # how often to pick up questions added by other workers
+REBUILD_SECONDS = 3600     # full rebuilds also drop deleted/edited questions
+
+
+def trigrams(text: str):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """In-process trigram posting lists over lowercase question text.
+
+    A query's candidates are the intersection of the postings of its trigrams (rarest first);
+    each candidate is then checked with a real substring test, so results match `icontains`
+    exactly while only touching documents that can match.
+    """
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.texts: List[str] = []
+        self.postings = defaultdict(lambda: array('I'))
+
+    def add(self, doc_id: str, text: str):
+        position = len(self.ids)
+        lowered = (text or '').lower()
+        self.ids.append(doc_id)
+        self.texts.append(lowered)
+        for gram in trigrams(lowered):
+            self.postings[gram].append(position)
+
+    def candidates(self, query: str):
+        grams = trigrams(query)
+        if not grams:
+            # Shorter than a trigram: nothing to intersect, fall back to checking every text
+            return range(len(self.texts))
+        lists = sorted((self.postings.get(gram) for gram in grams), key=lambda p: len(p) if p else 0)
+        if not lists[0]:
+            return []
+        found = set(lists[0])
+        for posting in lists[1:]:
+            found.intersection_update(posting)
+            if not found:
+                break
+        return found
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[str]:
+        """Ids of questions containing `query` (case-insensitive), best matches first.
+
+        Whole-text matches rank first, then prefix matches, then matches at a word start,
+        then anywhere; earlier and tighter matches break ties.
+        """
+        if limit is not None:
+            return self.search_page(query, 0, limit)[0]
+        return [self.ids[position] for _, _, _, position in sorted(self._matches(query))]
+
+    def search_page(self, query: str, offset: int, limit: int) -> Tuple[List[str], int]:
+        """One page of `search` plus the total number of matches, keeping only `offset + limit` in the heap."""
+        matches = self._matches(query)
+        top = heapq.nsmallest(offset + limit, matches)[offset:]
+        return [self.ids[position] for _, _, _, position in top], len(matches)
+
+    def _matches(self, query: str):
+        query = query.lower()
+        ranked = []
+        for position in self.candidates(query):
+            text = self.texts[position]
+            offset = text.find(query)
+            if offset < 0:
+                continue
+            if len(text) == len(query):
+                quality = 0
+            elif offset == 0:
+                quality = 1
+            elif not text[offset - 1].isalnum():
+                quality = 2
+            else:
+                quality = 3
+            ranked.append((quality, offset, len(text), position))
+        return ranked
+
+
+class QuestionTextIndex:
+    """Keeps a TrigramIndex over the Question collection current.
+
+    New questions are appended incrementally (by ObjectId order) every REFRESH_SECONDS or right
+    after an upload; a full rebuild every REBUILD_SECONDS drops deleted or edited questions.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.index = None
+        self.last_id = None
+        self.built_at = 0.0
+        self.refreshed_at = 0.0
+
+    def _append_new(self, index: TrigramIndex):
+        from app.models.question import Question
+        questions = Question.objects.only('id', 'question').order_by('id')
+        if self.last_id is not None:
+            questions = questions.filter(id__gt=self.last_id)
+        for q in questions:
+            index.add(str(q.id), q.question)
+            self.last_id = q.id
+        self.refreshed_at = time.monotonic()
+
+    def rebuild(self) -> TrigramIndex:
+        with self._lock:
+            self.last_id = None
+            index = TrigramIndex()
+            self._append_new(index)
+            self.index = index
+            self.built_at = self.refreshed_at
+            return index
+
+    def refresh(self):
+        """Pick up questions added since the last refresh."""
+        with self._lock:
+            if self.index is not None:
+                self._append_new(self.index)
+
+    def current(self) -> TrigramIndex:
+        now = time.monotonic()
+        if self.index is None or now - self.built_at > REBUILD_SECONDS:
+            return self.rebuild()
+        if now - self.refreshed_at > REFRESH_SECONDS:
+            self.refresh()
+        return self.index
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[str]:
+        return self.current().search(query, limit)
+
+    def search_page(self, query: str, offset: int, limit: int) -> Tuple[List[str], int]:
+        return self.current().search_page(query, offset, limit)
+
+
+question_text_index = QuestionTextIndex()
@@ -1,21 +1,62 @@
+from pymongo import UpdateOne
 from app.models.user import User, CourseProgress
-from app.utils.db import connect_db
+from app.services.user_cache import user_cache
+
+PROGRESS_STATUSES = ('ongoing', 'completed')
+
 
 def update_progress(user_id, course_id, title):
-    connect_db()
-    user = User.objects(_id=user_id).first()
+    # One conditional $push: only matches if no progress entry has this course_id yet
+    added = User.objects(_id=user_id, progress__course_id__ne=course_id).update_one(
+        push__progress=CourseProgress(course_id=course_id, title=title)
+    )
+    if added:
+        user_cache.invalidate(user_id)
+        return {"message": "Progress updated"}
 
-    if not user:
+    # Nothing matched: either the course is already tracked or the user does not exist
+    if not user_cache.get(user_id, ('_id',)):
         return {"error": "User not found"}
+    return {"message": "Course already in progress"}
 
-    # Check if course already in progress
-    for course in user.progress:
-        if course.course_id == course_id:
-            return {"message": "Course already in progress"}
-
-    # Add course to progress
-    new_course = CourseProgress(course_id=course_id, title=title)
-    user.progress.append(new_course)
-    user.save()
 
+def set_progress_status(user_id, course_id, status):
+    """Change the status of one tracked course in place with the positional operator."""
+    updated = User._get_collection().update_one(
+        {'_id': user_id, 'progress.course_id': course_id},
+        {'$set': {'progress.$.status': status}}
+    )
+    if not updated.matched_count:
+        return {"error": "Course not in progress"}
+    user_cache.invalidate(user_id)
     return {"message": "Progress updated"}
+
+
+def sync_progress(user_id, changes):
+    """Apply many course status changes for one user in a single bulk_write.
+
+    Each change becomes two mutually exclusive updates: set the status if the course is tracked,
+    push a new entry if it is not. Exactly one of them matches, and nothing is read first.
+    """
+    operations = []
+    for change in changes:
+        course_id = change['course_id']
+        status = change.get('status', 'ongoing')
+        if status not in PROGRESS_STATUSES:
+            raise ValueError(f"Invalid status for {course_id}: {status}")
+        operations.append(UpdateOne(
+            {'_id': user_id, 'progress.course_id': course_id},
+            {'$set': {'progress.$.status': status}}
+        ))
+        operations.append(UpdateOne(
+            {'_id': user_id, 'progress.course_id': {'$ne': course_id}},
+            {'$push': {'progress': {'course_id': course_id, 'title': change.get('title'), 'status': status}}}
+        ))
+    if not operations:
+        return {"message": "Nothing to sync", "changed": 0}
+
+    result = User._get_collection().bulk_write(operations, ordered=True)
+    if not result.matched_count:
+        return {"error": "User not found"}
+    user_cache.invalidate(user_id)
+    return {"message": "Progress synced", "changed": result.modified_count}
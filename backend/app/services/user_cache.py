@@ -0,0 +1,138 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+from flask import g, has_app_context
+
+from app.utils.metrics import metrics
+
+USER_CACHE_SIZE = int(os.getenv('USER_CACHE_SIZE', 10000))
+USER_CACHE_TTL = float(os.getenv('USER_CACHE_TTL', 30))  # bounds staleness across workers
+
+
+class CachedUser:
+    __slots__ = ('doc', 'fields', 'expires')
+
+    def __init__(self, doc: Dict, fields: Optional[frozenset], expires: float):
+        self.doc = doc
+        self.fields = fields  # None when the whole document was loaded
+        self.expires = expires
+
+    def covers(self, fields: Optional[frozenset]) -> bool:
+        return self.fields is None or (fields is not None and fields <= self.fields)
+
+
+class UserCache:
+    """Raw `users` documents cached per request (identity map on `flask.g`) and across requests (LRU).
+
+    Reads may ask for a projection; an entry serves any projection it covers. Every write path calls
+    `invalidate`, and the TTL bounds how long another worker's stale copy can live.
+    """
+
+    def __init__(self, maxsize: int = USER_CACHE_SIZE, ttl: float = USER_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._emails = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _request_map(self):
+        if not has_app_context():
+            return None
+        if 'user_identity_map' not in g:
+            g.user_identity_map = {}
+        return g.user_identity_map
+
+    def _record(self, layer: str, hit: bool):
+        metrics.inc('user_cache_requests_total', layer=layer, outcome='hit' if hit else 'miss')
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            total = self.hits + self.misses
+        metrics.set('user_cache_hit_ratio', round(self.hits / total, 4))
+
+    def get_cached(self, user_id: str, fields: Iterable[str] = None) -> Optional[Dict]:
+        """Cached document for the user if one covers `fields`; never touches the database."""
+        user_id = str(user_id)
+        fields = frozenset(fields) if fields else None
+        request_map = self._request_map()
+        if request_map is not None:
+            entry = request_map.get(user_id)
+            if entry is not None and entry.covers(fields):
+                self._record('request', True)
+                return entry.doc
+
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and (entry.expires < time.monotonic() or not entry.covers(fields)):
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(user_id)
+        self._record('lru', entry is not None)
+        if entry is None:
+            return None
+        if request_map is not None:
+            request_map[user_id] = entry
+        return entry.doc
+
+    def store(self, user_id: str, doc: Optional[Dict], fields: Iterable[str] = None):
+        if doc is None:
+            return
+        user_id = str(user_id)
+        entry = CachedUser(doc, frozenset(fields) if fields else None, time.monotonic() + self.ttl)
+        request_map = self._request_map()
+        if request_map is not None:
+            request_map[user_id] = entry
+        with self._lock:
+            self._entries[user_id] = entry
+            self._entries.move_to_end(user_id)
+            if doc.get('email'):
+                self._emails[doc['email']] = user_id
+            while len(self._entries) > self.maxsize:
+                evicted, old = self._entries.popitem(last=False)
+                self._emails.pop(old.doc.get('email'), None)
+
+    def get(self, user_id: str, fields: Iterable[str] = None) -> Optional[Dict]:
+        """The user's document (projected to `fields` if given), from cache or one `find_one`."""
+        doc = self.get_cached(user_id, fields)
+        if doc is not None:
+            return doc
+        from app.models.user import User
+        projection = dict.fromkeys(fields, 1) if fields else None
+        doc = User._get_collection().find_one({'_id': user_id}, projection)
+        self.store(user_id, doc, fields)
+        return doc
+
+    def get_by_email(self, email: str, fields: Iterable[str] = None) -> Optional[Dict]:
+        with self._lock:
+            user_id = self._emails.get(email)
+        if user_id is not None:
+            doc = self.get_cached(user_id, fields)
+            if doc is not None:
+                return doc
+        from app.models.user import User
+        wanted = set(fields or ()) | {'email'}
+        doc = User._get_collection().find_one({'email': email}, dict.fromkeys(wanted, 1) if fields else None)
+        if doc is not None:
+            self.store(str(doc['_id']), doc, wanted if fields else None)
+        return doc
+
+    def invalidate(self, user_id) -> None:
+        user_id = str(user_id)
+        request_map = self._request_map()
+        if request_map is not None:
+            request_map.pop(user_id, None)
+        with self._lock:
+            entry = self._entries.pop(user_id, None)
+            if entry is not None:
+                self._emails.pop(entry.doc.get('email'), None)
+        metrics.inc('user_cache_invalidations_total')
+
+
+user_cache = UserCache()
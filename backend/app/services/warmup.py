@@ -0,0 +1,124 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable
+
+from app.utils.metrics import metrics
+
+RETRY_SECONDS = 5  # failed required steps are retried until the process is ready
+
+
+class Warmup:
+    """Named warmup steps, run once per process before it takes traffic, and their per-step state.
+
+    A step is pending, warming, warm or failed; the process is ready once every required step is
+    warm. Steps must be idempotent: post_fork runs all of them again in each worker, and steps whose
+    structures were already built in the preloaded master return at once.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.steps: Dict[str, tuple] = OrderedDict()  # name -> (fn, required)
+        self.components: Dict[str, Dict] = OrderedDict()
+        self.started_at = time.time()
+        self._thread = None
+
+    def add(self, name: str, fn: Callable, required: bool = True):
+        self.steps[name] = (fn, required)
+        self.components[name] = {'state': 'pending', 'required': required}
+
+    def run(self, names: Iterable[str] = None) -> Dict:
+        """Run the named steps (all by default) in registration order; a failure does not stop the rest."""
+        for name in (names or list(self.steps)):
+            fn, required = self.steps[name]
+            self.components[name] = {'state': 'warming', 'required': required}
+            started = time.perf_counter()
+            try:
+                fn()
+                component = {'state': 'warm', 'required': required}
+            except Exception as e:
+                print(f"Error warming {name}: {str(e)}")
+                component = {'state': 'failed', 'required': required, 'error': str(e)}
+            component['seconds'] = round(time.perf_counter() - started, 3)
+            self.components[name] = component
+            metrics.set('warmup_seconds', component['seconds'], component=name)
+            metrics.set('warmup_warm', 1 if component['state'] == 'warm' else 0, component=name)
+        metrics.set('ready', 1 if self.ready else 0)
+        return self.status()
+
+    def start(self):
+        """Warm every step on a background thread so liveness is answered while the worker warms up."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            for name, (_, required) in self.steps.items():
+                self.components[name] = {'state': 'pending', 'required': required}
+            metrics.set('ready', 0)
+            self._thread = threading.Thread(target=self._run_logged, name='warmup', daemon=True)
+            self._thread.start()
+
+    def _run_logged(self):
+        started = time.perf_counter()
+        self.run()
+        while not self.ready:
+            # e.g. Mongo was unreachable at boot: stay unready, but do not stay cold forever
+            time.sleep(RETRY_SECONDS)
+            self.run([name for name, c in self.components.items() if c['required'] and c['state'] == 'failed'])
+        print(f"[✓] Warmup done in {time.perf_counter() - started:.2f}s, ready")
+
+    @property
+    def ready(self) -> bool:
+        return all(c['state'] == 'warm' for c in self.components.values() if c['required'])
+
+    def status(self) -> Dict:
+        return {
+            'ready': self.ready,
+            'uptime_seconds': round(time.time() - self.started_at, 3),
+            'warmup_seconds': round(sum(c.get('seconds', 0) for c in self.components.values()), 3),
+            'components': {name: dict(component) for name, component in self.components.items()}
+        }
+
+
+def ping_mongo():
+    from mongoengine.connection import get_db
+    get_db().command('ping')
+
+
+def ensure_mongo_indexes():
+    # Each of these creates its indexes once per process on first use
+    from app.services.recommendation_store import recommendation_collection
+    from app.services.score_history import rollup_collection
+    from app.services.jobs import jobs_collection
+    recommendation_collection()
+    rollup_collection()
+    jobs_collection()
+
+
+def warm_catalogs():
+    from app.utils.catalog import catalog_store
+    catalog_store.current()
+
+
+def warm_suggester():
+    from app.services.suggest import suggester
+    if suggester.index is None:
+        suggester.build()
+
+
+def warm_question_text_index():
+    from app.services.trigram import question_text_index
+    question_text_index.current()
+
+
+def warm_skill_index():
+    from app.services.skill_gaps import skill_gap_recommender
+    skill_gap_recommender.index()
+
+
+warmup = Warmup()
+warmup.add('mongo', ping_mongo)
+warmup.add('catalogs', warm_catalogs)
+warmup.add('suggester', warm_suggester)
+warmup.add('question_text_index', warm_question_text_index)
+warmup.add('skill_index', warm_skill_index, required=False)
+warmup.add('mongo_indexes', ensure_mongo_indexes, required=False)
@@ -0,0 +1,135 @@
+# app/utils/catalog.py
+# Curated catalogs served by the /api/recommendations/search* endpoints, loaded from
+# database/catalogs/*.json and reloaded whenever a file changes.
+import json
+import os
+import sys
+import threading
+import time
+from typing import Dict, Tuple
+
+from app.services.ranking import BM25Index
+from app.utils.metrics import metrics
+
+CATALOG_DIR = os.getenv(
+    'CATALOG_DIR',
+    os.path.join(os.path.dirname(__file__), '..', '..', '..', 'database', 'catalogs')
+)
+KINDS = ('courses', 'experiences', 'internships')
+CHECK_SECONDS = 2  # how often a request may stat the catalog files
+
+
+class CatalogItem:
+    __slots__ = ('title', 'url', 'description', 'tags', 'image')
+
+    def __init__(self, title, url, description='', tags=(), image=''):
+        self.title = title
+        self.url = url
+        self.description = description
+        # Tags repeat across items, so every copy shares one interned string
+        self.tags = tuple(sys.intern(tag) for tag in tags)
+        self.image = image
+
+    def get(self, field, default=None):
+        return getattr(self, field, default)
+
+    def to_dict(self) -> Dict:
+        return {
+            "title": self.title,
+            "url": self.url,
+            "description": self.description,
+            "tags": list(self.tags),
+            "image": self.image
+        }
+
+
+class CatalogSnapshot:
+    """Immutable set of catalog items and their search indexes; swapped whole on reload."""
+
+    def __init__(self, items: Dict[str, Tuple[CatalogItem, ...]], version):
+        self.version = version
+        self.items = items
+        self.indexes = {kind: BM25Index(entries) for kind, entries in items.items()}
+        self.combined = BM25Index([item for kind in KINDS for item in items.get(kind, ())])
+
+    def footprint(self) -> Dict:
+        """Approximate bytes held by the items (strings counted once) and by the search indexes."""
+        seen = set()
+
+        def size(obj):
+            if id(obj) in seen:
+                return 0
+            seen.add(id(obj))
+            return sys.getsizeof(obj)
+
+        item_bytes = 0
+        for entries in self.items.values():
+            item_bytes += size(entries)
+            for item in entries:
+                item_bytes += size(item) + size(item.tags)
+                item_bytes += sum(size(getattr(item, field)) for field in ('title', 'url', 'description', 'image'))
+                item_bytes += sum(size(tag) for tag in item.tags)
+
+        index_bytes = 0
+        for index in list(self.indexes.values()) + [self.combined]:
+            index_bytes += size(index.postings) + size(index.norms) + size(index.idf)
+            index_bytes += sum(size(term) + size(posting) for term, posting in index.postings.items())
+
+        return {
+            'version': self.version,
+            'items': {kind: len(entries) for kind, entries in self.items.items()},
+            'item_bytes': item_bytes,
+            'index_bytes': index_bytes
+        }
+
+
+class CatalogStore:
+    def __init__(self, directory: str = CATALOG_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._checked_at = 0.0
+
+    def _paths(self):
+        return {kind: os.path.join(self.directory, f'{kind}.json') for kind in KINDS}
+
+    def _version(self):
+        return tuple(os.stat(path).st_mtime_ns for path in self._paths().values())
+
+    def load(self) -> CatalogSnapshot:
+        version = self._version()
+        items = {}
+        for kind, path in self._paths().items():
+            with open(path, encoding='utf-8') as f:
+                items[kind] = tuple(CatalogItem(**entry) for entry in json.load(f))
+        snapshot = CatalogSnapshot(items, version)
+        self._snapshot = snapshot  # single reference swap; readers keep whichever snapshot they hold
+        footprint = snapshot.footprint()
+        metrics.set('catalog_item_bytes', footprint['item_bytes'])
+        metrics.set('catalog_index_bytes', footprint['index_bytes'])
+        metrics.inc('catalog_reloads_total')
+        return snapshot
+
+    def current(self) -> CatalogSnapshot:
+        """The latest snapshot, reloading it first if a catalog file changed."""
+        snapshot = self._snapshot
+        now = time.monotonic()
+        if snapshot is not None and now - self._checked_at < CHECK_SECONDS:
+            return snapshot
+        with self._lock:
+            self._checked_at = now
+            try:
+                if self._snapshot is None or self._version() != self._snapshot.version:
+                    return self.load()
+            except (OSError, ValueError, TypeError) as e:
+                if self._snapshot is None:
+                    raise
+                print(f"Error reloading catalogs, keeping version {self._snapshot.version}: {e}")
+            return self._snapshot
+
+
+catalog_store = CatalogStore()
+
+
+if __name__ == '__main__':
+    print(json.dumps(catalog_store.current().footprint(), indent=2))
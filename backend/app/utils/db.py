@@ -1,4 +1,4 @@
-from mongoengine import connect
+from mongoengine import connect, disconnect
 import os
 from dotenv import load_dotenv
 
@@ -9,6 +9,11 @@ def connect_db():
     db_name = "dashboard"  # same as your earlier JS code
     connect(db=db_name, host=db_uri)
 
+def reconnect_db():
+    """Drop a connection inherited from a forking parent and open a fresh one in this process."""
+    disconnect()
+    connect_db()
+
 def init_db():
     """Initialize the database with the Flask app context."""
     app = create_app()
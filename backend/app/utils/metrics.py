@@ -0,0 +1,69 @@
+# app/utils/metrics.py
+import threading
+from collections import defaultdict
+from typing import Dict, Tuple
+
+
+def _key(name: str, labels: Dict[str, str]) -> Tuple:
+    return (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+
+
+class Metrics:
+    """Thread-safe in-process counters, gauges and summaries (count/sum/max) for /api/metrics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = defaultdict(float)
+        self.gauges = {}
+        self.summaries = {}
+
+    def inc(self, name: str, value: float = 1, **labels):
+        with self._lock:
+            self.counters[_key(name, labels)] += value
+
+    def set(self, name: str, value: float, **labels):
+        with self._lock:
+            self.gauges[_key(name, labels)] = value
+
+    def observe(self, name: str, value: float, **labels):
+        with self._lock:
+            summary = self.summaries.setdefault(_key(name, labels), [0, 0.0, 0.0])
+            summary[0] += 1
+            summary[1] += value
+            summary[2] = max(summary[2], value)
+
+    def value(self, name: str, **labels) -> float:
+        key = _key(name, labels)
+        with self._lock:
+            return self.counters.get(key, self.gauges.get(key, 0))
+
+    def snapshot(self) -> Dict:
+        def label(key):
+            name, labels = key
+            return name + (('{' + ','.join(f'{k}="{v}"' for k, v in labels) + '}') if labels else '')
+
+        with self._lock:
+            return {
+                'counters': {label(k): v for k, v in self.counters.items()},
+                'gauges': {label(k): v for k, v in self.gauges.items()},
+                'summaries': {
+                    label(k): {'count': c, 'sum': round(s, 6), 'max': round(m, 6)}
+                    for k, (c, s, m) in self.summaries.items()
+                }
+            }
+
+    def prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines = [f'{name} {value}' for name, value in snapshot['counters'].items()]
+        lines += [f'{name} {value}' for name, value in snapshot['gauges'].items()]
+        for name, summary in snapshot['summaries'].items():
+            base, _, labels = name.partition('{')
+            labels = ('{' + labels) if labels else ''
+            lines.append(f'{base}_count{labels} {summary["count"]}')
+            lines.append(f'{base}_sum{labels} {summary["sum"]}')
+            lines.append(f'{base}_max{labels} {summary["max"]}')
+        return '\n'.join(lines) + '\n'
+
+
+metrics = Metrics()
@@ -0,0 +1,50 @@
+# app/utils/pagination.py
+# Opaque continuation tokens shared by the search and listing routes.
+import base64
+import json
+import zlib
+from typing import Dict, Optional
+
+from app.services.ranking import search_options, DEFAULT_LIMIT
+
+MAX_OFFSET = 1000  # ranked results are only paged this deep; refine the query instead
+
+
+def _fingerprint(scope: str) -> int:
+    return zlib.crc32(scope.encode('utf-8'))
+
+
+def encode_cursor(scope: str, **state) -> str:
+    """Token for the next page; `scope` (the query or domain) is baked in so it cannot be reused elsewhere."""
+    payload = json.dumps({'s': _fingerprint(scope), **state}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token: Optional[str], scope: str) -> Dict:
+    if not token:
+        return {}
+    try:
+        state = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+    if not isinstance(state, dict) or state.pop('s', None) != _fingerprint(scope):
+        raise ValueError('Cursor does not belong to this query')
+    return state
+
+
+def ranked_page_options(args, default_limit: int = DEFAULT_LIMIT):
+    """`search_options` plus the offset carried by `cursor`; raises ValueError for a bad cursor."""
+    query, limit, explain = search_options(args, default_limit)
+    offset = decode_cursor(args.get('cursor'), query).get('o', 0)
+    if not isinstance(offset, int) or not 0 <= offset < MAX_OFFSET:
+        raise ValueError('Invalid cursor')
+    return query, limit, explain, offset
+
+
+def ranked_page_fields(query: str, offset: int, limit: int, total: int) -> Dict:
+    """`next_cursor` and `total_estimate` for a page of ranked results."""
+    end = offset + limit
+    return {
+        'next_cursor': encode_cursor(query, o=end) if end < total and end < MAX_OFFSET else None,
+        'total_estimate': total
+    }
@@ -2,99 +2,236 @@
 import os
 import json
 import requests
-from typing import List, Dict
-from app.models.user import User
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Iterator
 from app.models.recommendation import Recommendation
+from app.services.admission import serpapi_ledger
+from app.services.breaker import serpapi_breaker, CircuitOpen
+from app.services.recommendation_store import store_documents
+from app.services.user_cache import user_cache
+from app.utils.catalog import catalog_store
+from app.utils.metrics import metrics
 from datetime import datetime
 
 
 
 SERP_API_KEY = os.getenv('SERP_API_KEY')
 SERP_API_URL = os.getenv('SERP_API_URL', 'https://serpapi.com/search')
+STREAM_WORKERS = int(os.getenv('RECOMMENDATION_STREAM_WORKERS', 6))  # concurrent searches per streamed refresh
 
+# (query template, category) pairs searched for every interest
+RECOMMENDATION_QUERIES = (
+    ("{} online course", 'course'),
+    ("{} internship", 'internship'),
+    ("{} project github", 'project'),
+)
 
-def fetch_serpapi_results(query: str) -> dict:
-    """Fetch results from SERP API."""
+# Category -> local catalog searched instead of SerpAPI in degraded mode
+FALLBACK_CATALOGS = {'course': 'courses', 'internship': 'internships', 'project': 'experiences'}
+
+
+def serpapi_params(query: str, num: int = 10) -> dict:
+    """Query parameters for a SERP API Google search."""
     params = {
         'q': query,
         'api_key': SERP_API_KEY,
-        'engine': 'google',
-        'num': 10
+        'engine': 'google'
+    }
+    if num:
+        params['num'] = num
+    return params
+
+
+def interests_query(interests) -> str:
+    """Search query for a user's interests (a list, or a JSON string on older documents)."""
+    if isinstance(interests, str):
+        try:
+            interests = json.loads(interests or "[]")
+        except Exception:
+            interests = []
+    return " ".join(interests or []) or "online tech courses"
+
+
+def summarize_results(results: List[Dict], limit: int = 5) -> List[Dict]:
+    """Trim organic results to the fields the frontend shows."""
+    return [
+        {
+            "title": r.get("title"),
+            "link": r.get("link"),
+            "snippet": r.get("snippet")
+        } for r in results[:limit]
+    ]
+
+
+def recommendation_fields(user_id: str, result: dict, category: str) -> dict:
+    """Recommendation document fields for one organic search result."""
+    return {
+        'user': user_id,
+        'title': result.get('title', ''),
+        'url': result.get('link', ''),
+        'description': result.get('snippet', ''),
+        'tags': [tag.strip() for tag in result.get('title', '').split()],
+        'category': category.lower()
+    }
+
+
+def catalog_results(query: str, category: str = None, reason: str = 'error', limit: int = 10) -> dict:
+    """Local catalog matches shaped like SERP API results, served while SerpAPI is unavailable."""
+    metrics.inc('recommendations_fallback_total', reason=reason)
+    metrics.inc('recommendations_source_total', source='catalog')
+    try:
+        snapshot = catalog_store.current()
+    except Exception as e:
+        print(f"Error loading catalogs for fallback: {str(e)}")
+        return {'organic_results': [], 'degraded': True}
+    index = snapshot.indexes[FALLBACK_CATALOGS[category]] if category in FALLBACK_CATALOGS else snapshot.combined
+    return {
+        'organic_results': [
+            {'title': item.title, 'link': item.url, 'snippet': item.description}
+            for item in (index.documents[hit.doc_id] for hit in index.search(query, limit))
+        ],
+        'degraded': True
     }
-    
+
+
+def fallback_recommendations(query: str, reason: str = 'error') -> List[Dict]:
+    return summarize_results(catalog_results(query, reason=reason)['organic_results'])
+
+
+def fetch_serpapi_results(query: str, category: str = None) -> dict:
+    """Fetch results from SERP API, falling back to the local catalogs when it is down or over budget."""
+    if serpapi_breaker.rejecting:
+        return catalog_results(query, category, 'open')
+    if not serpapi_ledger.spend():
+        return catalog_results(query, category, 'quota')
+
     try:
-        response = requests.get(SERP_API_URL, params=params)
+        response = serpapi_breaker.call(requests.get, SERP_API_URL, params=serpapi_params(query))
         response.raise_for_status()
+        metrics.inc('recommendations_source_total', source='serpapi')
         return response.json()
+    except CircuitOpen:
+        return catalog_results(query, category, 'open')
     except Exception as e:
         print(f"Error fetching from SERP API: {str(e)}")
-        return {'organic_results': []}
+        return catalog_results(query, category)
 
 
 def store_recommendations(user_id: str, results: dict, category: str) -> None:
-    """Store recommendations in the database."""
-    category = category.lower()
-
-    for result in results.get('organic_results', []):
-        recommendation = Recommendation(
-            user=user_id,
-            title=result.get('title', ''),
-            url=result.get('link', ''),
-            description=result.get('snippet', ''),
-            tags=[tag.strip() for tag in result.get('title', '').split()],
-            category=category
+    """Store recommendations in the database, one document per user, category and normalized URL."""
+    try:
+        store_documents(
+            recommendation_fields(user_id, result, category) for result in results.get('organic_results', [])
         )
-        try:
-            recommendation.save()
-        except Exception as e:
-            print(f"Error saving recommendation: {str(e)}")
+    except Exception as e:
+        print(f"Error saving recommendation: {str(e)}")
 
 
 def get_user_recommendations(user_id: str) -> List[Dict]:
     """Retrieve the latest recommendations for the user."""
-    user = User.objects(id=user_id).first()
+    user = user_cache.get(user_id, ('interests',))
     if not user:
         return []
 
-    try:
-        interests = json.loads(user.interests or "[]")
-    except Exception:
-        interests = []
-
-    query = " ".join(interests) or "online tech courses"
-
-    params = {
-        "q": query,
-        "engine": "google",
-        "api_key": SERP_API_KEY,
-    }
+    query = interests_query(user.get('interests'))
+    if serpapi_breaker.rejecting:
+        return fallback_recommendations(query, 'open')
+    if not serpapi_ledger.spend():
+        return fallback_recommendations(query, 'quota')
 
     try:
-        response = requests.get(SERP_API_URL, params=params)
+        response = serpapi_breaker.call(requests.get, SERP_API_URL, params=serpapi_params(query, num=None))
         if response.status_code != 200:
-            return []
-        results = response.json().get("organic_results", [])
-        return [
-            {
-                "title": r.get("title"),
-                "link": r.get("link"),
-                "snippet": r.get("snippet")
-            } for r in results[:5]
-        ]
+            return fallback_recommendations(query)
+        metrics.inc('recommendations_source_total', source='serpapi')
+        return summarize_results(response.json().get("organic_results", []))
+    except CircuitOpen:
+        return fallback_recommendations(query, 'open')
     except Exception as e:
         print(f"Error in get_user_recommendations: {str(e)}")
-        return []
+        return fallback_recommendations(query)
+
+
+def planned_searches(interests: List[str]):
+    """(category, query) pairs for the interests, cut down to what the SerpAPI budget affords.
+
+    The final listing query is budgeted too; searches for later interests are shed first.
+    """
+    searches = [
+        (category, template.format(interest))
+        for interest in interests
+        for template, category in RECOMMENDATION_QUERIES
+    ]
+    affordable = max(0, serpapi_ledger.affordable(len(searches) + 1) - 1)
+    return searches[:affordable], len(searches) - affordable
+
+
+def start_refresh(user_id: str, interests: List[str]):
+    """Plan a refresh and clear the results it replaces; returns (searches, shed, degraded)."""
+    searches, shed = planned_searches(interests)
+    if serpapi_breaker.rejecting:
+        # Keep the stored results rather than replacing them with fallback matches
+        return [], len(searches) + shed, True
+
+    # Clear existing search recommendations (offline catalog matches are owned by the batch job)
+    if searches:
+        Recommendation.objects(user=user_id, source__ne='catalog').delete()
+    return searches, shed, False
 
 
 def update_recommendations(user_id: str, interests: List[str]) -> Dict[str, List[Dict]]:
     """Update recommendations based on user interests."""
-    # Clear existing recommendations
-    Recommendation.objects(user=user_id).delete()
+    searches, shed, degraded = start_refresh(user_id, interests)
 
     # Fetch and store new recommendations
-    for interest in interests:
-        store_recommendations(user_id, fetch_serpapi_results(f"{interest} online course"), 'course')
-        store_recommendations(user_id, fetch_serpapi_results(f"{interest} internship"), 'internship')
-        store_recommendations(user_id, fetch_serpapi_results(f"{interest} project github"), 'project')
+    for category, query in searches:
+        results = fetch_serpapi_results(query, category)
+        degraded = degraded or results.get('degraded', False)
+        store_recommendations(user_id, results, category)
+
+    return {
+        "recommendations": get_user_recommendations(user_id),
+        "shed_searches": max(0, shed),
+        "degraded": degraded
+    }
 
-    return {"recommendations": get_user_recommendations(user_id)}
+
+def stream_recommendation_updates(user_id: str, interests: List[str]) -> Iterator[Dict]:
+    """`update_recommendations` as events: each search's results as soon as they are fetched and stored.
+
+    Searches run concurrently on up to STREAM_WORKERS threads, so the first `results` event arrives
+    after the fastest upstream call instead of after all of them. A final `done` event carries the
+    listing and totals that `update_recommendations` returns.
+    """
+    searches, shed, degraded = start_refresh(user_id, interests)
+    if searches:
+        pool = ThreadPoolExecutor(max_workers=min(STREAM_WORKERS, len(searches)))
+        try:
+            pending = {
+                pool.submit(fetch_serpapi_results, query, category): (category, query)
+                for category, query in searches
+            }
+            for future in as_completed(pending):
+                category, query = pending[future]
+                results = future.result()
+                found = results.get('organic_results', [])
+                degraded = degraded or results.get('degraded', False)
+                store_recommendations(user_id, results, category)
+                yield {
+                    'event': 'results',
+                    'category': category,
+                    'query': query,
+                    'degraded': results.get('degraded', False),
+                    'results': summarize_results(found, limit=len(found))
+                }
+        finally:
+            # A client that disconnects closes the generator; searches not started yet are dropped
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    yield {
+        'event': 'done',
+        'searches': len(searches),
+        'shed_searches': max(0, shed),
+        'degraded': degraded,
+        'recommendations': get_user_recommendations(user_id)
+    }
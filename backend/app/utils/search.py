@@ -1,7 +1,14 @@
+from bson import ObjectId
 from app.models.question import Question
+from app.services.ranking import DEFAULT_LIMIT
+from app.services.trigram import question_text_index
 
-def search_questions(query):
-    results = Question.objects(question__icontains=query)
+def search_questions(query, limit=DEFAULT_LIMIT, offset=0):
+    """One page of matching questions and the total number of matches."""
+    # Same matches as question__icontains, served from the trigram index instead of a regex scan
+    ids, total = question_text_index.search_page(query, offset, limit)
+    by_id = {str(q.id): q for q in Question.objects(id__in=ids)}
+    results = [by_id[i] for i in ids if i in by_id]
     return [
         {
             "id": str(q.id),
@@ -16,13 +23,25 @@ def search_questions(query):
             },
             "badge": q.badge
         } for q in results
-    ]
+    ], total
 
 def get_all_domains():
     return Question.objects().distinct('domain')
 
-def get_questions_by_domain(domain):
-    results = Question.objects(domain=domain)
+def get_questions_by_domain(domain, limit=DEFAULT_LIMIT, after=None):
+    """Questions of a domain in id order after `after`, plus the next page's starting id and the domain size.
+
+    Keyset paging on (domain, _id): each page is an index range scan that stops after `limit + 1`.
+    """
+    query = Question.objects(domain=domain)
+    if after:
+        if not ObjectId.is_valid(after):
+            raise ValueError('Invalid cursor')
+        query = query.filter(id__gt=after)
+    page = list(query.order_by('id').limit(limit + 1))
+    next_after = str(page[limit - 1].id) if len(page) > limit else None
+    results = page[:limit]
+    total = Question._get_collection().count_documents({'domain': domain})
     return [
         {
             "id": str(q.id),
@@ -36,4 +55,4 @@ def get_questions_by_domain(domain):
             },
             "badge": q.badge
         } for q in results
-    ]
+    ], next_after, total
@@ -0,0 +1,204 @@
+"""Async serving mode.
+
+    uvicorn asgi:app --workers 4
+
+The outbound-heavy routes (Inngest events, the Clerk metadata PATCH and the SerpAPI-backed
+recommendation routes) are served natively on the event loop with httpx and PyMongo's async
+client, so a waiting upstream call costs a coroutine instead of a worker thread. Every other
+path is handed to the regular Flask app through asgiref's WSGI adapter.
+"""
+import json
+import os
+import re
+from functools import wraps
+from urllib.parse import parse_qs
+
+import jwt
+from asgiref.wsgi import WsgiToAsgi
+
+from app.services.admission import check_admission, REFRESH_LIMIT, READ_LIMIT, WRITE_LIMIT
+from app.services.user_cache import user_cache
+from app.services.breaker import CircuitOpen
+from app.services.warmup import warmup
+from app.services.jobs import job_pool
+from app.services.async_outbound import (
+    AsyncClients, send_inngest_event_async, update_clerk_metadata_async,
+    get_user_recommendations_async, update_recommendations_async
+)
+from wsgi import app as flask_app
+
+clients = AsyncClients()
+flask_asgi = WsgiToAsgi(flask_app)
+
+
+class Request:
+    def __init__(self, scope, body: bytes, params: dict):
+        self.scope = scope
+        self.body = body
+        self.params = params
+        self.headers = {k.decode('latin-1').lower(): v.decode('latin-1') for k, v in scope['headers']}
+        self.args = {k: v[0] for k, v in parse_qs(scope.get('query_string', b'').decode()).items()}
+
+    def json(self):
+        return json.loads(self.body or b'{}')
+
+
+def jwt_identity(request: Request):
+    """Identity of a flask_jwt_extended access token, or None if it is missing/invalid."""
+    auth_header = request.headers.get('authorization', '')
+    if not auth_header.startswith('Bearer '):
+        return None
+    try:
+        return jwt.decode(auth_header.split(' ')[1], os.getenv('JWT_SECRET_KEY'), algorithms=['HS256'])['sub']
+    except Exception:
+        return None
+
+
+def admission_controlled(route, rate, capacity):
+    """Async counterpart of app.services.admission.admission_controlled."""
+    def decorator(handler):
+        @wraps(handler)
+        async def wrapper(request):
+            try:
+                body_user = request.json().get('userId')
+            except ValueError:
+                body_user = None
+            client = request.scope.get('client') or ('unknown',)
+            user = jwt_identity(request) or body_user or client[0]
+            admitted, headers = check_admission(str(user), route, rate, capacity)
+            if not admitted:
+                return 429, {'success': False, 'message': 'Too many requests'}, headers
+            status, payload, *extra = await handler(request)
+            return status, payload, {**headers, **(extra[0] if extra else {})}
+        return wrapper
+    return decorator
+
+
+async def send_to_inngest(request):
+    try:
+        response = await send_inngest_event_async(clients, request.json())
+        if response.status_code == 202:
+            return 200, {"success": True}
+        return 500, {"success": False, "error": response.text}
+    except Exception as e:
+        return 500, {"success": False, "error": str(e)}
+
+
+@admission_controlled('clerk.update', *WRITE_LIMIT)
+async def update_interests(request):
+    data = request.json()
+    user_id = data.get('userId')
+    if not user_id:
+        return 400, {'success': False, 'message': 'Missing userId'}
+
+    try:
+        response = await update_clerk_metadata_async(
+            clients, user_id, data.get('interests', []), data.get('skills', [])
+        )
+        if response.status_code == 200:
+            user_cache.invalidate(user_id)
+            return 200, {'success': True, 'message': 'Metadata updated'}
+        return 500, {'success': False, 'message': response.text}
+    except CircuitOpen as e:
+        return (503, {'success': False, 'message': 'Clerk is unavailable, try again later'},
+                {'Retry-After': str(max(1, int(e.retry_after + 0.999)))})
+    except Exception as e:
+        return 500, {'success': False, 'message': str(e)}
+
+
+@admission_controlled('recommendations.read', *READ_LIMIT)
+async def get_live_recommendations(request):
+    user_id = request.params['user_id']
+    if jwt_identity(request) != user_id:
+        return 403, {'success': False, 'message': 'Unauthorized'}
+
+    return 200, {'success': True, 'data': await get_user_recommendations_async(clients, user_id)}
+
+
+@admission_controlled('recommendations.refresh', *REFRESH_LIMIT)
+async def refresh_recommendations(request):
+    user_id = request.params['user_id']
+    if jwt_identity(request) != user_id:
+        return 403, {'success': False, 'message': 'Unauthorized'}
+
+    interests = request.json().get('interests', [])
+    if not isinstance(interests, list):
+        return 400, {'success': False, 'message': 'Interests must be a list'}
+
+    await clients.db['users'].update_one({'_id': user_id}, {'$set': {'interests': interests}})
+    user_cache.invalidate(user_id)
+    return 200, {'success': True, 'data': await update_recommendations_async(clients, user_id, interests)}
+
+
+ROUTES = [
+    ('POST', re.compile(r'^/api/inngest$'), send_to_inngest),
+    ('POST', re.compile(r'^/api/update-interests$'), update_interests),
+    ('GET', re.compile(r'^/api/recommendations/(?P<user_id>[^/]+)/live$'), get_live_recommendations),
+    ('POST', re.compile(r'^/api/recommendations/(?P<user_id>[^/]+)/interests$'), refresh_recommendations),
+]
+
+
+def match_route(method, path):
+    for route_method, pattern, handler in ROUTES:
+        found = pattern.match(path)
+        if found and route_method == method:
+            return handler, found.groupdict()
+    return None, None
+
+
+async def read_body(receive) -> bytes:
+    body = b''
+    while True:
+        message = await receive()
+        body += message.get('body', b'')
+        if not message.get('more_body'):
+            return body
+
+
+async def send_json(send, status, payload, extra_headers=None):
+    body = json.dumps(payload).encode()
+    headers = [
+        (b'content-type', b'application/json'),
+        (b'content-length', str(len(body)).encode()),
+        (b'access-control-allow-origin', b'*'),  # same default as CORS(app) on the Flask side
+    ]
+    headers += [(k.lower().encode(), v.encode()) for k, v in (extra_headers or {}).items()]
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': headers,
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await clients.open()
+            # Flask routes served through WsgiToAsgi enqueue jobs too; uvicorn has no post_fork
+            job_pool.start()
+            warmup.start()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            job_pool.stop()
+            await clients.close()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        return await lifespan(receive, send)
+
+    if scope['type'] == 'http':
+        handler, params = match_route(scope['method'], scope['path'])
+        if handler is not None:
+            request = Request(scope, await read_body(receive), params)
+            try:
+                status, payload, *headers = await handler(request)
+            except ValueError:
+                status, payload, headers = 400, {'success': False, 'message': 'Invalid JSON body'}, []
+            return await send_json(send, status, payload, *headers)
+
+    return await flask_asgi(scope, receive, send)
@@ -0,0 +1,123 @@
+"""Concurrent-request capacity of the sync (gunicorn threads) and async (uvicorn) serving modes.
+
+    cd backend && python benchmarks/outbound_concurrency.py --concurrency 500 --delay 0.5
+
+A local stub upstream answers every request after `--delay` seconds (standing in for Inngest,
+Clerk and SerpAPI). Both servers get one worker and are pointed at the stub, then `--concurrency`
+clients hit POST /api/inngest at once. With N threads the sync path needs about
+concurrency / N * delay seconds; the async path should finish in roughly one delay.
+Needs the app's MongoDB to be reachable, as the app connects on import.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def stub_upstream(delay, port):
+    async def handle(reader, writer):
+        headers = await reader.readuntil(b'\r\n\r\n')
+        length = 0
+        for line in headers.split(b'\r\n'):
+            if line.lower().startswith(b'content-length:'):
+                length = int(line.split(b':')[1])
+        if length:
+            await reader.readexactly(length)
+        await asyncio.sleep(delay)
+        body = json.dumps({'organic_results': []}).encode()
+        status = b'202 Accepted' if headers.startswith(b'POST /e') else b'200 OK'
+        writer.write(b'HTTP/1.1 ' + status + b'\r\nContent-Type: application/json\r\nContent-Length: '
+                     + str(len(body)).encode() + b'\r\nConnection: close\r\n\r\n' + body)
+        await writer.drain()
+        writer.close()
+
+    return await asyncio.start_server(handle, '127.0.0.1', port, backlog=4096)
+
+
+def start_server(mode, port, stub_port, threads):
+    env = dict(
+        os.environ,
+        INNGEST_EVENT_URL=f'http://127.0.0.1:{stub_port}/e',
+        SERP_API_URL=f'http://127.0.0.1:{stub_port}/search',
+        CLERK_API_URL=f'http://127.0.0.1:{stub_port}/v1',
+        WEB_CONCURRENCY='1',
+        GUNICORN_THREADS=str(threads),
+        BIND=f'127.0.0.1:{port}',
+    )
+    if mode == 'sync':
+        command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app']
+    else:
+        command = [sys.executable, '-m', 'uvicorn', 'asgi:app', '--port', str(port), '--workers', '1',
+                   '--backlog', '4096', '--log-level', 'warning']
+    return subprocess.Popen(command, cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+async def wait_until_up(client, url, timeout=120):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            await client.get(url)
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.5)
+    raise RuntimeError(f'server at {url} did not start')
+
+
+async def load(port, concurrency):
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(timeout=600, limits=limits) as client:
+        await wait_until_up(client, f'http://127.0.0.1:{port}/api/recommendations/search?q=python')
+
+        async def one():
+            started = time.perf_counter()
+            response = await client.post(f'http://127.0.0.1:{port}/api/inngest',
+                                         json={'data': {'userId': 'bench'}})
+            return time.perf_counter() - started, response.status_code
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(one() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for latency, _ in results)
+    ok = sum(1 for _, status in results if status == 200)
+    return {
+        'ok': ok,
+        'seconds': round(elapsed, 2),
+        'req_per_s': round(concurrency / elapsed, 1),
+        'p50_ms': round(statistics.median(latencies) * 1000),
+        'p99_ms': round(latencies[int(len(latencies) * 0.99) - 1] * 1000),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--concurrency', type=int, default=500)
+    parser.add_argument('--delay', type=float, default=0.5, help="Stub upstream latency in seconds")
+    parser.add_argument('--threads', type=int, default=8, help="Threads of the sync gunicorn worker")
+    parser.add_argument('--port', type=int, default=5056)
+    parser.add_argument('--stub-port', type=int, default=5057)
+    args = parser.parse_args()
+
+    stub = await stub_upstream(args.delay, args.stub_port)
+    try:
+        for mode in ('sync', 'async'):
+            server = start_server(mode, args.port, args.stub_port, args.threads)
+            try:
+                print(mode, await load(args.port, args.concurrency))
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
+    finally:
+        stub.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
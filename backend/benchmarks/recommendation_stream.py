@@ -0,0 +1,136 @@
+"""Time-to-first-result of the streamed recommendations refresh against a slow SerpAPI stub.
+
+    cd backend && python benchmarks/recommendation_stream.py --interests python,ml --course 1.5 --internship 0.2 --project 0.8
+
+A local stub upstream answers each SerpAPI search after the delay configured for its category
+(course, internship or project queries; `--listing` for the final listing query). The app is
+started under gunicorn pointed at the stub, then POST /api/recommendations/<user>/interests/stream
+is read as server-sent events and the arrival time of every event is printed. The first `results`
+event should arrive after about the fastest category delay, not after the slowest one.
+Needs the app's MongoDB to be reachable, as the app connects on import.
+"""
+import argparse
+import asyncio
+import json
+import os
+import secrets
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit, parse_qs
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CATEGORY_WORDS = (('internship', 'internship'), ('project', 'project'), ('course', 'course'))
+
+
+async def stub_upstream(delays, port):
+    async def handle(reader, writer):
+        request_line, _, _ = (await reader.readuntil(b'\r\n\r\n')).partition(b'\r\n')
+        query = parse_qs(urlsplit(request_line.split()[1].decode()).query).get('q', [''])[0]
+        category = next((name for word, name in CATEGORY_WORDS if word in query), 'listing')
+        await asyncio.sleep(delays[category])
+        body = json.dumps({'organic_results': [
+            {'title': f'{query} result {n}', 'link': f'https://example.com/{category}/{n}', 'snippet': category}
+            for n in range(3)
+        ]}).encode()
+        writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: '
+                     + str(len(body)).encode() + b'\r\nConnection: close\r\n\r\n' + body)
+        await writer.drain()
+        writer.close()
+
+    return await asyncio.start_server(handle, '127.0.0.1', port)
+
+
+def access_token(secret, user_id):
+    from flask import Flask
+    from flask_jwt_extended import JWTManager, create_access_token
+    token_app = Flask(__name__)
+    token_app.config['JWT_SECRET_KEY'] = secret
+    JWTManager(token_app)
+    with token_app.app_context():
+        return create_access_token(identity=user_id)
+
+
+def start_server(port, stub_port, secret):
+    env = dict(
+        os.environ,
+        SERP_API_URL=f'http://127.0.0.1:{stub_port}/search',
+        JWT_SECRET_KEY=secret,
+        SERPAPI_TIMEOUT='30',
+        REFRESH_BURST='1000',
+        WEB_CONCURRENCY='1',
+        BIND=f'127.0.0.1:{port}',
+    )
+    command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app']
+    return subprocess.Popen(command, cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+async def wait_until_up(client, url, timeout=120):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            await client.get(url)
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.5)
+    raise RuntimeError(f'server at {url} did not start')
+
+
+async def stream(port, token, user_id, interests):
+    async with httpx.AsyncClient(timeout=600) as client:
+        await wait_until_up(client, f'http://127.0.0.1:{port}/api/recommendations/search?q=python')
+        events = []
+        started = time.perf_counter()
+        async with client.stream(
+            'POST', f'http://127.0.0.1:{port}/api/recommendations/{user_id}/interests/stream',
+            json={'interests': interests},
+            headers={'Authorization': f'Bearer {token}', 'Accept': 'text/event-stream'}
+        ) as response:
+            response.raise_for_status()
+            name = None
+            async for line in response.aiter_lines():
+                if line.startswith('event: '):
+                    name = line[len('event: '):]
+                elif line.startswith('data: '):
+                    data = json.loads(line[len('data: '):])
+                    events.append((time.perf_counter() - started, name, data))
+        return events
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--interests', default='python,machine learning')
+    parser.add_argument('--course', type=float, default=1.5, help="Stub delay for course searches")
+    parser.add_argument('--internship', type=float, default=0.2, help="Stub delay for internship searches")
+    parser.add_argument('--project', type=float, default=0.8, help="Stub delay for project searches")
+    parser.add_argument('--listing', type=float, default=0.2, help="Stub delay for the final listing query")
+    parser.add_argument('--user', default='stream-bench')
+    parser.add_argument('--port', type=int, default=5058)
+    parser.add_argument('--stub-port', type=int, default=5059)
+    args = parser.parse_args()
+
+    delays = {'course': args.course, 'internship': args.internship, 'project': args.project, 'listing': args.listing}
+    secret = secrets.token_hex(16)
+    stub = await stub_upstream(delays, args.stub_port)
+    server = start_server(args.port, args.stub_port, secret)
+    try:
+        events = await stream(args.port, access_token(secret, args.user), args.user,
+                              [interest.strip() for interest in args.interests.split(',') if interest.strip()])
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+        stub.close()
+
+    for seconds, name, data in events:
+        detail = data.get('query') if name == 'results' else {k: v for k, v in data.items() if k != 'recommendations'}
+        print(f'{seconds:7.3f}s  {name:8}  {detail}')
+    first = next((seconds for seconds, name, _ in events if name == 'results'), None)
+    searched = min(delays['course'], delays['internship'], delays['project'])
+    print({'first_result_s': first and round(first, 3), 'fastest_upstream_s': searched,
+           'done_s': round(events[-1][0], 3) if events else None})
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
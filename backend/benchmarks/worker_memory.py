@@ -0,0 +1,86 @@
+"""Compare per-worker memory with and without the preloaded, GC-frozen master (Linux only).
+
+    cd backend && python benchmarks/worker_memory.py --workers 4
+
+Starts gunicorn twice (GUNICORN_PRELOAD=1 and 0), warms every worker with a few search requests and
+reads /proc/<pid>/smaps_rollup for each worker. PSS splits shared pages between the processes that
+map them, so the preload run should show a much lower PSS and private-dirty size per worker.
+"""
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WARMUP_PATHS = (
+    '/api/recommendations/search?q=python',
+    '/api/recommendations/search-experiences?q=web',
+    '/api/recommendations/search-internships?q=ai',
+    '/api/assessment/search?q=learning',
+)
+
+
+def worker_pids(master_pid):
+    children = []
+    for task in os.listdir(f'/proc/{master_pid}/task'):
+        with open(f'/proc/{master_pid}/task/{task}/children') as f:
+            children.extend(int(pid) for pid in f.read().split())
+    return children
+
+
+def memory_kb(pid):
+    fields = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1])
+    return fields
+
+
+def measure(preload, workers, port, requests_per_worker):
+    env = dict(os.environ, GUNICORN_PRELOAD='1' if preload else '0', WEB_CONCURRENCY=str(workers),
+               BIND=f'127.0.0.1:{port}')
+    master = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app'],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        deadline = time.time() + 120
+        while len(worker_pids(master.pid)) < workers and time.time() < deadline:
+            time.sleep(0.5)
+        for _ in range(requests_per_worker * workers):
+            for path in WARMUP_PATHS:
+                try:
+                    urllib.request.urlopen(f'http://127.0.0.1:{port}{path}', timeout=30).read()
+                except Exception:
+                    time.sleep(0.5)
+        pids = worker_pids(master.pid)
+        return [memory_kb(pid) for pid in pids]
+    finally:
+        master.send_signal(signal.SIGTERM)
+        master.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--port', type=int, default=5055)
+    parser.add_argument('--requests', type=int, default=5, help="Warmup requests per worker per route")
+    args = parser.parse_args()
+
+    print(f"{'mode':<10}{'workers':>8}{'rss MiB':>10}{'pss MiB':>10}{'private dirty MiB':>20}")
+    for preload in (False, True):
+        stats = measure(preload, args.workers, args.port, args.requests)
+        count = len(stats) or 1
+        rss = sum(s.get('Rss', 0) for s in stats) / count / 1024
+        pss = sum(s.get('Pss', 0) for s in stats) / count / 1024
+        dirty = sum(s.get('Private_Dirty', 0) for s in stats) / count / 1024
+        print(f"{'preload' if preload else 'per-worker':<10}{len(stats):>8}{rss:>10.1f}{pss:>10.1f}{dirty:>20.1f}")
+
+
+if __name__ == '__main__':
+    main()
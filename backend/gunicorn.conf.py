@@ -0,0 +1,23 @@
+# gunicorn.conf.py
+import multiprocessing
+import os
+
+bind = os.getenv('BIND', '0.0.0.0:5000')
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv('GUNICORN_THREADS', 1))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+
+# Import the app once in the master so workers share its memory copy-on-write
+preload_app = os.getenv('GUNICORN_PRELOAD', '1') != '0'
+
+
+def when_ready(server):
+    # Runs in the master after the preloaded app is imported and before the first fork
+    if preload_app:
+        import wsgi
+        wsgi.prefork_warmup()
+
+
+def post_fork(server, worker):
+    import wsgi
+    wsgi.post_fork()
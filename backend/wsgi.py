@@ -0,0 +1,47 @@
+"""Production WSGI entry point.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+The `app/` package shadows `app.py` on the import path, so the Flask app is loaded from the file.
+With `preload_app` the master imports it once, builds the immutable catalog/question indexes and
+freezes the GC before forking, so workers share those pages copy-on-write. Database connections and
+job queue threads are the only state that is rebuilt per worker (see `post_fork`). Each worker then
+runs the full warmup in the background and reports ready on /readyz once it is done.
+"""
+import gc
+import importlib.util
+import os
+import sys
+import time
+
+_spec = importlib.util.spec_from_file_location('main_app', os.path.join(os.path.dirname(__file__), 'app.py'))
+main_app = importlib.util.module_from_spec(_spec)
+sys.modules['main_app'] = main_app
+_spec.loader.exec_module(main_app)
+
+app = main_app.app
+
+# Structures built in the master and inherited by every worker
+PREFORK_STEPS = ('question_search', 'catalogs', 'suggester', 'question_text_index', 'skill_index')
+
+
+def prefork_warmup():
+    """Build every immutable structure in the master so workers inherit it instead of rebuilding it."""
+    started = time.perf_counter()
+    main_app.warmup.run(PREFORK_STEPS)
+    # Move everything allocated so far into the permanent generation: the collector in each worker
+    # then never touches (and never dirties) the inherited pages when it runs
+    gc.collect()
+    gc.freeze()
+    print(f"[✓] Pre-fork warmup done in {time.perf_counter() - started:.2f}s, "
+          f"{gc.get_freeze_count()} objects frozen")
+
+
+def post_fork():
+    """Replace connections inherited from the master; PyMongo clients are not fork-safe."""
+    from app.utils.db import reconnect_db
+    reconnect_db()
+    main_app.open_clients()
+    # Threads do not survive fork, so each worker starts its own job workers and warmup
+    main_app.job_pool.start()
+    main_app.warmup.start()